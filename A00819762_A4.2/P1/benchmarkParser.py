@@ -0,0 +1,102 @@
+"""
+Microbenchmark of the number parsers of computeStatistics.py.
+
+The bundled TC1-TC7 files are repeated into one temporary file of at least
+--lines lines, which is then parsed by:
+  regex   the original per-line re.sub + replace + float() loop
+  cleanup every line through the translate-table cleanup (no fast path)
+  fast    parse_blocks: bulk blocks, then per-line fast path, then cleanup
+
+Usage: python benchmarkParser.py [--lines N]
+"""
+import argparse
+import glob
+import os
+import re
+import tempfile
+import time
+
+from computeStatistics import iter_numbers_from_file, parse_lines
+from mmapreader import iter_lines
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def regex_parser(filename):
+    """
+    The per-line regex parser computeStatistics.py started with.
+    """
+    numbers = []
+    with open(filename, 'r', encoding='utf-8') as file:
+        for line in file:
+            clean_line = re.sub(r'[^0-9,.-]', '', line).strip()
+            clean_line = clean_line.replace(',', '')
+            if clean_line:
+                try:
+                    numbers.append(float(clean_line))
+                except ValueError:
+                    pass
+    return numbers
+
+
+def cleanup_parser(filename):
+    """
+    Every line through the cleanup path, as if the fast path always failed.
+    """
+    return list(parse_lines(line + b'#' for line in iter_lines(filename)))
+
+
+def fast_parser(filename):
+    """
+    The parser computeStatistics.py uses now.
+    """
+    return list(iter_numbers_from_file(filename))
+
+
+def build_input(path, lines):
+    """
+    Writes the TC files repeatedly to path until it holds `lines` lines.
+    """
+    sources = []
+    for name in sorted(glob.glob(os.path.join(HERE, "TC*.txt"))):
+        with open(name, 'rb') as file:
+            data = file.read()
+        sources.append(data if data.endswith(b'\n') else data + b'\n')
+    corpus = b''.join(sources)
+    per_copy = corpus.count(b'\n')
+
+    with open(path, 'wb') as file:
+        for _ in range(-(-lines // per_copy)):
+            file.write(corpus)
+    return -(-lines // per_copy) * per_copy
+
+
+def main():
+    """
+    Times the three parsers and checks they agree.
+    """
+    parser = argparse.ArgumentParser(prog="benchmarkParser.py")
+    parser.add_argument("--lines", type=int, default=2_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "numbers.txt")
+        total = build_input(path, args.lines)
+        print(f"Lines: {total:,}")
+        print(f"{'parser':<8} {'seconds':>10} {'lines/s':>14}")
+
+        results = {}
+        for name, function in (("regex", regex_parser),
+                               ("cleanup", cleanup_parser),
+                               ("fast", fast_parser)):
+            start = time.perf_counter()
+            results[name] = function(path)
+            seconds = time.perf_counter() - start
+            print(f"{name:<8} {seconds:>10.3f} {total / seconds:>14,.0f}")
+
+    if not results["regex"] == results["cleanup"] == results["fast"]:
+        print("Mismatch between parsers")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Benchmarks the statistics backends of computeStatistics.py on synthetic data.
+
+Usage: python benchmarkStatistics.py [--size N] [--seed S]
+"""
+import argparse
+import random
+import sys
+import time
+from array import array
+
+from computeStatistics import compute_exact_statistics, compute_statistics
+
+
+def time_call(function, *args):
+    """
+    Runs function(*args) once and returns (result, seconds).
+    """
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    """
+    Compares the sort-based path with the selection-based exact backend.
+    """
+    parser = argparse.ArgumentParser(prog="benchmarkStatistics.py")
+    parser.add_argument("--size", type=int, default=10_000_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    # Values shaped like the TC files: integers and two-decimal readings
+    rng = random.Random(args.seed)
+    numbers = [round(rng.uniform(0, 500), rng.choice((0, 2)))
+               for _ in range(args.size)]
+    buffer = array('d', numbers)
+
+    print(f"Values: {args.size:,}")
+    print(f"list of floats: ~{(sys.getsizeof(numbers) + 24 * len(numbers)) / 2**20:,.0f} MiB")
+    print(f"array('d'):     ~{buffer.buffer_info()[1] * buffer.itemsize / 2**20:,.0f} MiB")
+
+    sort_result, sort_time = time_call(compute_statistics, numbers)
+    select_result, select_time = time_call(compute_exact_statistics, buffer)
+
+    print(f"{'backend':<8} {'seconds':>10}")
+    print(f"{'sort':<8} {sort_time:>10.3f}")
+    print(f"{'select':<8} {select_time:>10.3f}")
+    print(f"speedup: {sort_time / select_time:.2f}x")
+
+    if sort_result != select_result:
+        print("Mismatch between backends:", sort_result, select_result)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,33 +1,126 @@
+import argparse
+import glob
+import json
+import os
 import sys
 import time
-import re 
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+# mmapreader.py is shared by the A4.2 programs and lives one level up
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+import numpystats
+from mmapreader import complete_lines_end, iter_blocks, read_fingerprint, split_ranges
+from selection import median as select_median, mode as select_mode
+from streamstats import (MisraGries, Reservoir, RunningStats, SortedCounts,
+                         median_and_mode)
+
+# Bounded-memory (--stream, --incremental) modes: values kept for the
+# approximate median and counters kept for the approximate mode
+DEFAULT_SAMPLE_SIZE = 100000
+DEFAULT_MODE_CAPACITY = 1000
+
+# Byte ranges handed to each worker in --workers mode; more ranges than
+# workers keeps every core busy when some ranges parse slower than others
+RANGES_PER_WORKER = 4
+
+# --incremental mode keeps the running aggregate of every input here,
+# next to StatisticsResults.txt
+STATE_FILE = "StatisticsResults.state.json"
+STATE_VERSION = 2
+
+# Every byte except digits, dots and minus signs; commas (thousand
+# separators) are removed too so values parse correctly as floats
+NON_NUMERIC_BYTES = bytes(byte for byte in range(256) if byte not in b'0123456789.-')
+
+# Fast path: a line made only of these bytes needs no cleanup, so float()
+# can take it as is (surrounding blanks are ignored by float() too)
+CLEAN_LINE_BYTES = b'0123456789.- \t'
+
+# A block made only of these bytes is one clean number per line
+CLEAN_BLOCK_DELETE = b'0123456789.-\r\n'
+
+
+def parse_lines(lines):
+    """
+    Yields the number found in each line (bytes), skipping invalid lines.
+    Lines are only decoded when they have to be reported.
+    """
+    for line in lines:
+        if not line.strip(CLEAN_LINE_BYTES):
+            try:
+                yield float(line)
+                continue
+            except ValueError:
+                pass  # Let the cleanup below decide (and report) the line
+
+        # Remove all non-numeric characters except digits, dots, and minus signs
+        clean_line = line.translate(None, NON_NUMERIC_BYTES)
+
+        if clean_line:
+            try:
+                yield float(clean_line)
+            except ValueError:
+                text = line.decode('utf-8', errors='replace').strip()
+                print(f"Skipping invalid data: '{text}'")
+
+
+def parse_blocks(blocks):
+    """
+    Yields the numbers of blocks of complete lines. Blocks holding only
+    digits, dots, minus signs and line breaks are converted in bulk; any
+    other block goes line by line through parse_lines.
+    """
+    for block in blocks:
+        if not block.translate(None, CLEAN_BLOCK_DELETE):
+            try:
+                values = list(map(float, block.split()))
+            except ValueError:
+                pass
+            else:
+                yield from values
+                continue
+        yield from parse_lines(block.splitlines())
+
+
+def iter_numbers_from_file(filename):
+    """
+    Yields the numbers of a file one at a time, removing non-numeric
+    characters. Only the current line is kept in memory.
+    """
+    try:
+        yield from parse_blocks(iter_blocks(filename))
+    except FileNotFoundError:
+        print(f"Error: File '{filename}' not found.")
+        sys.exit(1)
+    except Exception as e:
+        print(f"Unexpected error: {e}")
+        sys.exit(1)
+
 
 def read_numbers_from_file(filename):
     """
     Reads numbers from a file, removes non-numeric characters, and handles encoding issues.
     """
-    try:
-        with open(filename, 'r', encoding='utf-8') as file:
-            numbers = []
-            for line in file:
-                # Remove all non-numeric characters except digits, dots, and minus signs
-                clean_line = re.sub(r'[^0-9,.-]', '', line).strip()
-
-                # Remove commas (used as thousand separators) to correctly parse as floats
-                clean_line = clean_line.replace(',', '')
-
-                if clean_line:
-                    try:
-                        numbers.append(float(clean_line))
-                    except ValueError:
-                        print(f"Skipping invalid data: '{line.strip()}'")
-
-        # If no valid numbers are found, exit with an error
-        if not numbers:
-            print("Error: The file is empty or contains only invalid data.")
-            sys.exit(1)
+    numbers = list(iter_numbers_from_file(filename))
+
+    # If no valid numbers are found, exit with an error
+    if not numbers:
+        print("Error: The file is empty or contains only invalid data.")
+        sys.exit(1)
+
+    return numbers
 
-        return numbers
+
+def read_numbers_array(filename):
+    """
+    Reads numbers into a NumPy array using the block parser of numpystats.
+    """
+    try:
+        blocks = iter_blocks(filename, block_size=numpystats.BLOCK_SIZE)
+        numbers = numpystats.read_numbers_array(blocks, parse_lines)
     except FileNotFoundError:
         print(f"Error: File '{filename}' not found.")
         sys.exit(1)
@@ -35,6 +128,12 @@ def read_numbers_from_file(filename):
         print(f"Unexpected error: {e}")
         sys.exit(1)
 
+    if numbers.size == 0:
+        print("Error: The file is empty or contains only invalid data.")
+        sys.exit(1)
+
+    return numbers
+
 
 def compute_statistics(numbers):
     """
@@ -66,48 +165,448 @@ def compute_statistics(numbers):
     return n, mean, median, mode, variance, std_dev  # ✅ Returning count
 
 
-def save_results(filename, count, mean, median, mode, variance, std_dev, elapsed_time):
+def compute_exact_statistics(numbers):
+    """
+    Computes the same results as compute_statistics for large inputs: values
+    are stored in a compact array('d') buffer and the median comes from a
+    linear-time selection instead of a sorted copy. The mode is counted one
+    value range at a time, so its frequency table holds only a slice of the
+    distinct values. Sum, median, mode and variance are separate passes
+    over the buffer.
+    """
+    buffer = numbers if isinstance(numbers, array) else array('d', numbers)
+    n = len(buffer)
+    if n == 0:
+        print("Error: The file is empty or contains only invalid data.")
+        sys.exit(1)
+
+    mean = sum(buffer) / n
+    median = select_median(buffer)
+
+    mode = select_mode(buffer)
+
+    variance = sum((x - mean) ** 2 for x in buffer) / n
+    std_dev = variance ** 0.5
+
+    return n, mean, median, mode, variance, std_dev
+
+
+def aggregate_range(filename, start, end):
+    """
+    Parses one byte range of a file and returns its partial aggregate:
+    (RunningStats, SortedCounts). The counts travel back to the parent as
+    sorted arrays, ready to be cut into value ranges.
+    """
+    counts = Counter(parse_blocks(iter_blocks(filename, start, end)))
+    return RunningStats.from_counts(counts), SortedCounts.from_counts(counts)
+
+
+def compute_parallel_statistics(filename, workers):
+    """
+    Computes count, mean, median, mode, variance and standard deviation by
+    parsing line-aligned byte ranges of the file in a process pool and
+    merging the partial aggregates each worker returns.
+    """
+    try:
+        ranges = split_ranges(filename, workers * RANGES_PER_WORKER)
+    except FileNotFoundError:
+        print(f"Error: File '{filename}' not found.")
+        sys.exit(1)
+
+    stats = RunningStats()
+    parts = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        partials = executor.map(aggregate_range, [filename] * len(ranges),
+                                *zip(*ranges))
+        # map returns ranges in file order, so first-seen order survives
+        for part_stats, part_counts in partials:
+            stats.merge(part_stats)
+            parts.append(part_counts)
+
+        if stats.count == 0:
+            print("Error: The file is empty or contains only invalid data.")
+            sys.exit(1)
+
+        return summarize_aggregate(stats, parts, executor.map, len(ranges))
+
+
+def summarize_aggregate(stats, parts, map_function=map, splits=1):
+    """
+    Turns merged RunningStats and the SortedCounts of every part, in input
+    order, into the (count, mean, median, mode, variance, std_dev) tuple.
+    The mode is combined over `splits` value ranges through map_function
+    (see median_and_mode).
+    """
+    median, mode = median_and_mode(parts, map_function, splits)
+    return (stats.count, stats.mean, median, mode,
+            stats.variance, stats.std_dev)
+
+
+def expand_filenames(patterns):
+    """
+    Expands glob patterns (for shells that do not) and keeps plain names.
+    """
+    filenames = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern))
+        filenames.extend(matches if matches else [pattern])
+    return filenames
+
+
+def compute_batch_statistics(filenames, workers):
     """
-    Saves computed statistics to a results file.
+    Aggregates many files concurrently, one task per file.
+    Returns ([(label, statistics)], pooled statistics); the pooled column is
+    built by merging the per-file aggregates, not by reading files again.
+    """
+    found = []
+    for filename in filenames:
+        if os.path.isfile(filename):
+            found.append(filename)
+        else:
+            print(f"Error: File '{filename}' not found.")
+
+    columns = []
+    pooled_stats = RunningStats()
+    pooled_parts = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        chunksize = max(1, len(found) // (workers * RANGES_PER_WORKER))
+        partials = executor.map(aggregate_range, found, [0] * len(found),
+                                [None] * len(found), chunksize=chunksize)
+        for filename, (stats, counts) in zip(found, partials):
+            if stats.count == 0:
+                print(f"Error: The file '{filename}' is empty or contains only invalid data.")
+                continue
+            label = os.path.splitext(os.path.basename(filename))[0]
+            columns.append((label, summarize_aggregate(stats, [counts])))
+            pooled_stats.merge(stats)
+            pooled_parts.append(counts)
+
+        if not columns:
+            print("Error: No file contained valid data.")
+            sys.exit(1)
+
+        return columns, summarize_aggregate(
+            pooled_stats, pooled_parts, executor.map,
+            workers * RANGES_PER_WORKER)
+
+
+def format_batch_table(columns, pooled):
+    """
+    Lays out per-file and pooled statistics as a tab-separated table with
+    one column per file, like the A4.2.P1 results sheet.
+    """
+    labels = [label for label, _ in columns] + ["POOLED"]
+    values = [statistics for _, statistics in columns] + [pooled]
+    rows = [("COUNT", 0, "{}"), ("MEAN", 1, "{:.2f}"), ("MEDIAN", 2, "{:.2f}"),
+            ("MODE", 3, "{:.2f}"), ("SD", 5, "{:.2f}"), ("VARIANCE", 4, "{:.2f}")]
+
+    lines = ["\t".join(["TC"] + labels)]
+    for name, index, template in rows:
+        lines.append("\t".join([name] + [template.format(v[index]) for v in values]))
+    return lines
+
+
+def load_state(state_path):
+    """
+    Loads the saved aggregates, keyed by absolute input path. A missing or
+    unreadable state file just means starting from scratch.
+    """
+    try:
+        with open(state_path, 'r', encoding='utf-8') as file:
+            state = json.load(file)
+    except FileNotFoundError:
+        return {}
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        print(f"Warning: '{state_path}' is corrupted; rescanning.")
+        return {}
+
+    if state.get("version") != STATE_VERSION:
+        return {}
+    return state.get("files", {})
+
+
+def save_state(state_path, files):
+    """
+    Writes the aggregates atomically, so an interrupted run keeps the
+    previous state.
+    """
+    temp_path = state_path + ".tmp"
+    with open(temp_path, 'w', encoding='utf-8') as file:
+        json.dump({"version": STATE_VERSION, "files": files}, file)
+    os.replace(temp_path, state_path)
+
+
+def summarize_sketches(stats, sample, frequent):
+    """
+    Turns the single-pass accumulators into the
+    (count, mean, median, mode, variance, std_dev) tuple; median and mode
+    are approximate.
+    """
+    mode = frequent.mode()
+    if mode is None:
+        # No value stood out of the summary; use the sample instead
+        freq = {}
+        for num in sample.sample:
+            freq[num] = freq.get(num, 0) + 1
+        mode = max(freq, key=freq.get)
+
+    return (stats.count, stats.mean, sample.median(), mode,
+            stats.variance, stats.std_dev)
+
+
+def add_to_sketches(numbers, stats, sample, frequent):
+    """
+    Feeds every number to the running stats, the sample and the frequent
+    values summary.
+    """
+    for num in numbers:
+        stats.add(num)
+        sample.add(num)
+        frequent.add(num)
+
+
+def compute_incremental_statistics(filename, state_path=STATE_FILE,
+                                   sample_size=DEFAULT_SAMPLE_SIZE,
+                                   mode_capacity=DEFAULT_MODE_CAPACITY):
+    """
+    Computes the statistics of an append-only file by parsing only the bytes
+    added since the previous run. The saved state is bounded whatever the
+    file size: byte offset, count, mean and M2 (exact), plus the sample and
+    Misra-Gries counters of --stream mode, so median and mode are
+    approximate.
+    """
+    if not os.path.isfile(filename):
+        print(f"Error: File '{filename}' not found.")
+        sys.exit(1)
+
+    files = load_state(state_path)
+    key = os.path.abspath(filename)
+    saved = files.get(key)
+
+    stats = RunningStats()
+    sample = Reservoir(sample_size)
+    frequent = MisraGries(mode_capacity)
+    offset = 0
+    if saved is not None:
+        size = os.path.getsize(filename)
+        if (saved["offset"] <= size
+                and read_fingerprint(filename, saved["offset"]) == saved["fingerprint"]
+                and saved["sample_size"] == sample_size
+                and saved["mode_capacity"] == mode_capacity):
+            stats = RunningStats(saved["count"], saved["mean"], saved["m2"])
+            sample = Reservoir(sample_size, seen=saved["sample_seen"],
+                               sample=saved["sample"])
+            frequent = MisraGries(mode_capacity, dict(saved["mode_counters"]))
+            offset = saved["offset"]
+        else:
+            print(f"Warning: '{filename}' changed since the last run; rescanning.")
+
+    # Only complete lines are saved; a line still being written is counted
+    # in this run's results but parsed again next time
+    end = complete_lines_end(filename, offset)
+    add_to_sketches(parse_blocks(iter_blocks(filename, offset, end)),
+                    stats, sample, frequent)
+
+    files[key] = {
+        "offset": end,
+        "fingerprint": read_fingerprint(filename, end),
+        "count": stats.count,
+        "mean": stats.mean,
+        "m2": stats.m2,
+        "sample_size": sample_size,
+        "sample_seen": sample.seen,
+        "sample": sample.sample,
+        "mode_capacity": mode_capacity,
+        "mode_counters": list(frequent.counters.items()),
+    }
+    save_state(state_path, files)
+
+    add_to_sketches(parse_blocks(iter_blocks(filename, end, None)),
+                    stats, sample, frequent)
+
+    if stats.count == 0:
+        print("Error: The file is empty or contains only invalid data.")
+        sys.exit(1)
+
+    return summarize_sketches(stats, sample, frequent)
+
+
+def compute_streaming_statistics(numbers, sample_size=DEFAULT_SAMPLE_SIZE,
+                                 mode_capacity=DEFAULT_MODE_CAPACITY):
+    """
+    Computes the same statistics as compute_statistics in a single pass over
+    any iterable, with memory that does not grow with the input.
+    Count, mean and variance are exact (Welford); median and mode are
+    approximated from a fixed-size random sample and a Misra-Gries summary.
+    """
+    stats = RunningStats()
+    sample = Reservoir(sample_size)
+    frequent = MisraGries(mode_capacity)
+    add_to_sketches(numbers, stats, sample, frequent)
+
+    if stats.count == 0:
+        print("Error: The file is empty or contains only invalid data.")
+        sys.exit(1)
+
+    return summarize_sketches(stats, sample, frequent)
+
+
+def save_results(filename, count, mean, median, mode, variance, std_dev, elapsed_time,
+                 approximate=""):
+    """
+    Saves computed statistics to a results file. `approximate` is appended
+    to the median and mode labels.
     """
     with open(filename, 'w', encoding='utf-8') as file:
         file.write(f"Total Numbers: {count}\n")  # ✅ Writing total count
         file.write(f"Mean: {mean:.2f}\n")
-        file.write(f"Median: {median:.2f}\n")
-        file.write(f"Mode: {mode:.2f}\n")
+        file.write(f"Median{approximate}: {median:.2f}\n")
+        file.write(f"Mode{approximate}: {mode:.2f}\n")
         file.write(f"Variance: {variance:.2f}\n")
         file.write(f"Standard Deviation: {std_dev:.2f}\n")
         file.write(f"Execution Time: {elapsed_time:.6f} seconds\n")
 
 
+def save_batch_results(filename, table, elapsed_time):
+    """
+    Saves the batch statistics table to a results file.
+    """
+    with open(filename, 'w', encoding='utf-8') as file:
+        for line in table:
+            file.write(line + "\n")
+        file.write(f"Execution Time: {elapsed_time:.6f} seconds\n")
+
+
+def run_batch(args):
+    """
+    Batch mode: statistics for several files or glob patterns at once.
+    """
+    start_time = time.time()
+
+    filenames = expand_filenames(args.filenames)
+    workers = args.workers if args.workers > 1 else os.cpu_count() or 1
+    columns, pooled = compute_batch_statistics(filenames, workers)
+    table = format_batch_table(columns, pooled)
+
+    elapsed_time = time.time() - start_time
+
+    for line in table:
+        print(line)
+    print(f"Execution Time: {elapsed_time:.6f} seconds")
+
+    save_batch_results("StatisticsResults.txt", table, elapsed_time)
+
+
+def is_batch(filenames):
+    """
+    Tells whether the command line names several files (or a pattern).
+    """
+    return len(filenames) > 1 or glob.has_magic(filenames[0])
+
+
+def parse_arguments():
+    """
+    Parses the command line.
+    """
+    parser = argparse.ArgumentParser(
+        prog="computeStatistics.py",
+        description="Computes descriptive statistics of a file of numbers.")
+    parser.add_argument(
+        "filenames", nargs="+", metavar="filename",
+        help="a file of numbers; several files or glob patterns produce one "
+             "table with per-file and pooled statistics")
+    parser.add_argument(
+        "--backend", choices=("sort", "select", "numpy"), default="sort",
+        help="'select' finds the exact median by selection on a compact "
+             "buffer instead of sorting a copy of the data, which saves "
+             "memory but is not faster; 'numpy' parses "
+             "and computes with NumPy, falling back to 'sort' when NumPy "
+             "is not installed")
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="parse line-aligned byte ranges of the file in N processes "
+             "(with several files: process N files at a time, default one "
+             "per CPU)")
+    parser.add_argument(
+        "--incremental", action="store_true",
+        help=f"parse only the bytes appended since the last run, using the "
+             f"aggregate saved in {STATE_FILE}; median and mode are "
+             f"approximate")
+    parser.add_argument(
+        "--stream", action="store_true",
+        help="single pass with constant memory; median and mode are approximate")
+    parser.add_argument(
+        "--sample-size", type=int, default=DEFAULT_SAMPLE_SIZE,
+        help="values sampled for the approximate median in --stream and "
+             "--incremental modes")
+    parser.add_argument(
+        "--mode-capacity", type=int, default=DEFAULT_MODE_CAPACITY,
+        help="counters kept for the approximate mode in --stream and "
+             "--incremental modes")
+    args = parser.parse_args()
+
+    # Several files are merged from exact per-file counts, which none of
+    # the single-file modes below feed
+    if is_batch(args.filenames):
+        single_file = [option for option, used in (
+            ("--stream", args.stream),
+            ("--incremental", args.incremental),
+            ("--backend", args.backend != "sort")) if used]
+        if single_file:
+            parser.error(f"{', '.join(single_file)}: only with a single file")
+    return args
+
+
 def main():
     """
     Main execution function.
     """
-    # Ensure correct usage with exactly one argument (file name)
-    if len(sys.argv) != 2:
-        print("Usage: python computeStatistics.py <filename>")
-        sys.exit(1)
+    args = parse_arguments()
+    if is_batch(args.filenames):
+        run_batch(args)
+        return
 
-    filename = sys.argv[1]
+    args.filename = args.filenames[0]
     start_time = time.time()
 
-    numbers = read_numbers_from_file(filename)
-    count, mean, median, mode, variance, std_dev = compute_statistics(numbers)  # ✅ Capturing count
+    if args.incremental:
+        count, mean, median, mode, variance, std_dev = compute_incremental_statistics(
+            args.filename, STATE_FILE, args.sample_size, args.mode_capacity)
+    elif args.workers > 1:
+        count, mean, median, mode, variance, std_dev = compute_parallel_statistics(
+            args.filename, args.workers)
+    elif args.stream:
+        count, mean, median, mode, variance, std_dev = compute_streaming_statistics(
+            iter_numbers_from_file(args.filename),
+            args.sample_size, args.mode_capacity)
+    elif args.backend == "numpy" and numpystats.available():
+        numbers = read_numbers_array(args.filename)
+        count, mean, median, mode, variance, std_dev = numpystats.compute_statistics(numbers)
+    elif args.backend == "select":
+        count, mean, median, mode, variance, std_dev = compute_exact_statistics(
+            iter_numbers_from_file(args.filename))
+    else:
+        numbers = read_numbers_from_file(args.filename)
+        count, mean, median, mode, variance, std_dev = compute_statistics(numbers)  # ✅ Capturing count
 
     elapsed_time = time.time() - start_time
 
+    # The sketch-based modes only estimate the median and mode
+    approximate = " (approximate)" if args.incremental or args.stream else ""
+
     # Print results to console
     print(f"Total Numbers: {count}")  # ✅ Display total count
     print(f"Mean: {mean:.2f}")
-    print(f"Median: {median:.2f}")
-    print(f"Mode: {mode:.2f}")
+    print(f"Median{approximate}: {median:.2f}")
+    print(f"Mode{approximate}: {mode:.2f}")
     print(f"Variance: {variance:.2f}")
     print(f"Standard Deviation: {std_dev:.2f}")
     print(f"Execution Time: {elapsed_time:.6f} seconds")
 
     # Save results to file
-    save_results("StatisticsResults.txt", count, mean, median, mode, variance, std_dev, elapsed_time)
+    save_results("StatisticsResults.txt", count, mean, median, mode, variance, std_dev, elapsed_time,
+                 approximate)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,141 @@
+"""
+Exact order statistics without a full sort, used by computeStatistics.py.
+
+Values are kept in a compact array('d') buffer (8 bytes per value instead
+of a list of float objects) and the median is found with Floyd-Rivest
+selection, which runs in expected linear time. The mode is counted one
+value range at a time, so its frequency table never holds every distinct
+value at once.
+
+This saves memory, not time: on 2,000,000 TC-like values
+(benchmarkStatistics.py --size 2000000) the buffer takes ~15 MiB against
+~62 MiB for a list of floats, and both paths take ~1.5-1.6 s.
+"""
+from array import array
+from bisect import bisect_right
+from collections import Counter
+import random
+
+# Below this size a plain sort is cheaper than another partition round
+SORT_THRESHOLD = 5000
+
+# Number of values sampled to pick the partition bounds of each round
+SAMPLE_SIZE = 1000
+
+# Value ranges counted one after the other when looking for the mode
+MODE_PARTS = 8
+
+
+def select(values, k, rng=None):
+    """
+    Returns the k-th smallest (0-based) value of an array or list.
+
+    Each round samples the candidates, takes two bounds from the sample that
+    bracket the k-th value with high probability, and keeps only the values
+    between them. The input is never modified; rounds work on new buffers
+    that shrink geometrically.
+    """
+    if not 0 <= k < len(values):
+        raise IndexError("selection index out of range")
+
+    rng = rng or random.Random(0)
+    candidates = values
+
+    while len(candidates) > SORT_THRESHOLD:
+        n = len(candidates)
+        sample = sorted(candidates[i] for i in rng.sample(range(n), SAMPLE_SIZE))
+
+        # Bracket position k/n of the sample with a margin of ~sqrt(sample)
+        position = k * SAMPLE_SIZE // n
+        margin = int(SAMPLE_SIZE ** 0.5)
+        low = sample[max(position - margin, 0)]
+        high = sample[min(position + margin, SAMPLE_SIZE - 1)]
+
+        # Generators feed the counts and arrays directly, so no round
+        # builds a list of boxed floats as large as its input
+        below = sum(1 for x in candidates if x < low)
+        if k < below:
+            candidates = array('d', (x for x in candidates if x < low))
+            continue
+
+        middle = array('d', (x for x in candidates if low <= x <= high))
+        if len(middle) == n:
+            # Heavy duplicates: peel off every copy of the lower bound instead
+            equal = sum(1 for x in candidates if x == low)
+            if k < equal:
+                return low
+            k -= equal
+            candidates = array('d', (x for x in candidates if x > low))
+            continue
+
+        if k < below + len(middle):
+            candidates = middle
+            k -= below
+            continue
+
+        k -= below + len(middle)
+        candidates = array('d', (x for x in candidates if x > high))
+
+    return sorted(candidates)[k]
+
+
+def median(values):
+    """
+    Exact median of an array or list, without sorting it.
+    """
+    n = len(values)
+    mid = n // 2
+    if n % 2 != 0:
+        return select(values, mid)
+
+    # The upper middle value is the smallest value not below the lower one
+    lower = select(values, mid - 1)
+    not_above = sum(1 for x in values if x <= lower)
+    if not_above > mid:
+        return lower
+    upper = min(x for x in values if x > lower)
+    return (lower + upper) / 2
+
+
+def mode(values, parts=MODE_PARTS, rng=None):
+    """
+    Most frequent value of an array or list; the first seen wins ties.
+
+    A single {value: count} table would hold a boxed float for every
+    distinct value. Instead one pass cuts the values at sampled quantiles
+    into `parts` compact arrays, in their original order, and each array
+    is counted with its own table and dropped before the next one.
+    """
+    n = len(values)
+    if n <= SORT_THRESHOLD * parts:
+        return Counter(values).most_common(1)[0][0]
+
+    rng = rng or random.Random(0)
+    sample = sorted(values[i] for i in rng.sample(range(n), SAMPLE_SIZE))
+    bounds = sorted({sample[i * SAMPLE_SIZE // parts]
+                     for i in range(1, parts)})
+
+    ranges = [array('d') for _ in range(len(bounds) + 1)]
+    appends = [part.append for part in ranges]
+    for x in values:
+        appends[bisect_right(bounds, x)](x)
+    del appends
+
+    best = best_count = best_index = None
+    while ranges:
+        counts = Counter(ranges.pop(0))
+        if not counts:
+            continue
+
+        # Within a range Counter keeps first-seen order; across ranges the
+        # position of the first occurrence decides
+        value, count = counts.most_common(1)[0]
+        if best is None or count > best_count:
+            best, best_count, best_index = value, count, None
+        elif count == best_count:
+            if best_index is None:
+                best_index = values.index(best)
+            index = values.index(value)
+            if index < best_index:
+                best, best_index = value, index
+    return best
@@ -0,0 +1,280 @@
+"""
+Single-pass accumulators used by computeStatistics.py.
+
+Each accumulator consumes numbers one at a time and keeps a fixed amount of
+state no matter how long the input is. RunningStats can be merged with
+another RunningStats, so parallel and pooled runs combine exact partial
+aggregates.
+"""
+import heapq
+import random
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import accumulate, chain, compress, repeat
+
+
+class RunningStats:
+    """
+    Welford accumulator for count, mean and M2 (sum of squared deviations).
+    """
+
+    def __init__(self, count=0, mean=0.0, m2=0.0):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+
+    @classmethod
+    def from_counts(cls, counts):
+        """
+        Builds the accumulator from a {value: count} table in two passes over
+        the distinct values.
+        """
+        count = sum(counts.values())
+        if count == 0:
+            return cls()
+        mean = sum(value * times for value, times in counts.items()) / count
+        m2 = sum(times * (value - mean) ** 2 for value, times in counts.items())
+        return cls(count, mean, m2)
+
+    def add(self, value):
+        """
+        Adds one value to the running count, mean and M2.
+        """
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def merge(self, other):
+        """
+        Combines another accumulator into this one (Chan et al. formula).
+        """
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            return self
+
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        return self
+
+    @property
+    def variance(self):
+        """
+        Population variance of the values seen so far.
+        """
+        return self.m2 / self.count if self.count else 0.0
+
+    @property
+    def std_dev(self):
+        """
+        Population standard deviation of the values seen so far.
+        """
+        return self.variance ** 0.5
+
+
+class SortedCounts:
+    """
+    Exact {value: count} table of one part of the input, stored as arrays
+    that pickle as plain bytes: the distinct values in ascending order,
+    their counts, the order in which each value was first seen in the
+    part, and the running count up to each value. median_and_mode()
+    combines several parts without walking every value in one process.
+    """
+
+    def __init__(self, values=(), counts=(), firsts=()):
+        self.values = array('d', values)
+        self.counts = array('q', counts)
+        self.firsts = array('q', firsts)
+        self.cumulative = array('q', accumulate(self.counts))
+
+    @classmethod
+    def from_counts(cls, counts):
+        """
+        Builds the table from a {value: count} dict in first-seen order.
+        """
+        keys = list(counts)
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        values = [keys[i] for i in order]
+        return cls(values, [counts[value] for value in values], order)
+
+    @property
+    def count(self):
+        """
+        Number of values counted in this part.
+        """
+        return self.cumulative[-1] if self.cumulative else 0
+
+    def count_below(self, value, right=False):
+        """
+        Number of values in this part below value (or up to it, with
+        right).
+        """
+        find = bisect_right if right else bisect_left
+        position = find(self.values, value)
+        return self.cumulative[position - 1] if position else 0
+
+
+def select_rank(parts, rank):
+    """
+    Value at 0-based position rank of all the parts' values in ascending
+    order. Each round pivots on the middle of the widest remaining range
+    and counts the values below it in every part with bisect, so only
+    O(k log n) rounds of k bisections are needed for k parts.
+    """
+    lows = [0] * len(parts)
+    highs = [len(part.values) for part in parts]
+    while True:
+        widest = max(range(len(parts)),
+                     key=lambda index: highs[index] - lows[index])
+        pivot = parts[widest].values[(lows[widest] + highs[widest]) // 2]
+
+        if rank < sum(part.count_below(pivot) for part in parts):
+            highs = [min(high, bisect_left(part.values, pivot))
+                     for part, high in zip(parts, highs)]
+        elif rank < sum(part.count_below(pivot, True) for part in parts):
+            return pivot
+        else:
+            lows = [max(low, bisect_right(part.values, pivot))
+                    for part, low in zip(parts, lows)]
+
+
+def range_mode(slices):
+    """
+    Mode of one value range, given as (part index, values, counts,
+    firsts) slices of every part. Returns (-count, (part index, first),
+    value), so the smallest result over all ranges is the most frequent
+    value with the first seen winning ties, or None for an empty range.
+    """
+    slices = [piece for piece in slices if piece[1]]
+    if not slices:
+        return None
+    if len(slices) == 1:
+        index, values, counts, firsts = slices[0]
+        top = max(counts)
+        first, value = min(compress(zip(firsts, values),
+                                    map(top.__eq__, counts)))
+        return -top, (index, first), value
+
+    # Equal values come out grouped, earliest part first, so the first
+    # entry of each group also gives its first-seen position
+    merged = heapq.merge(*(zip(values, repeat(index), firsts, counts)
+                           for index, values, counts, firsts in slices))
+    best = None
+    current = total = first_seen = None
+    for value, index, first, count in chain(merged, [(None,) * 4]):
+        if current is not None and value == current:
+            total += count
+            continue
+        if current is not None and (best is None
+                                    or (-total, first_seen) < best[:2]):
+            best = -total, first_seen, current
+        current, total, first_seen = value, count, (index, first)
+    return best
+
+
+def median_and_mode(parts, map_function=map, splits=1):
+    """
+    Exact median and mode (first seen wins ties) of parts given in input
+    order.
+
+    The median is picked with select_rank. For the mode, the values are
+    cut at splits - 1 quantiles into ranges; equal values always share a
+    range, so each range's counts are combined on their own, through
+    map_function (an executor's map runs them in the worker processes)
+    and only the per-range winners are compared here.
+    """
+    n = sum(part.count for part in parts)
+    mid = n // 2
+    if n % 2 != 0:
+        median = select_rank(parts, mid)
+    else:
+        median = (select_rank(parts, mid - 1) + select_rank(parts, mid)) / 2
+
+    bounds = [select_rank(parts, n * split // splits)
+              for split in range(1, splits)]
+    edges = [[0, *(bisect_left(part.values, bound) for bound in bounds),
+              len(part.values)] for part in parts]
+    ranges = [[(index, part.values[start:stop], part.counts[start:stop],
+                part.firsts[start:stop])
+               for index, (part, cuts) in enumerate(zip(parts, edges))
+               for start, stop in [cuts[split:split + 2]]]
+              for split in range(splits)]
+    _, _, mode = min(filter(None, map_function(range_mode, ranges)))
+    return median, mode
+
+
+class Reservoir:
+    """
+    Uniform random sample of fixed size (Vitter's algorithm R).
+    The median of the sample approximates the median of the stream.
+    """
+
+    def __init__(self, size=10000, seed=None, seen=0, sample=None):
+        self.size = size
+        self.seen = seen
+        self.sample = list(sample or [])
+        self._random = random.Random(seed)
+
+    def add(self, value):
+        """
+        Offers one value to the sample.
+        """
+        self.seen += 1
+        if len(self.sample) < self.size:
+            self.sample.append(value)
+            return
+        slot = int(self._random.random() * self.seen)
+        if slot < self.size:
+            self.sample[slot] = value
+
+    def median(self):
+        """
+        Median of the sample.
+        """
+        ordered = sorted(self.sample)
+        n = len(ordered)
+        mid = n // 2
+        return (ordered[mid] if n % 2 != 0 else
+                (ordered[mid - 1] + ordered[mid]) / 2)
+
+
+class MisraGries:
+    """
+    Frequent-items summary keeping at most `capacity` counters.
+    Any value occurring more than n / (capacity + 1) times is guaranteed
+    to survive, so the largest counter approximates the mode.
+    """
+
+    def __init__(self, capacity=1000, counters=None):
+        self.capacity = capacity
+        self.counters = dict(counters or {})
+
+    def add(self, value):
+        """
+        Counts one occurrence of value.
+        """
+        counters = self.counters
+        if value in counters:
+            counters[value] += 1
+        elif len(counters) < self.capacity:
+            counters[value] = 1
+        else:
+            # Table full: decrement every counter and drop the ones at zero
+            for key in list(counters):
+                counters[key] -= 1
+                if counters[key] == 0:
+                    del counters[key]
+
+    def mode(self):
+        """
+        Value with the largest counter (first seen wins ties), or None when
+        every counter has been cancelled out.
+        """
+        if not self.counters:
+            return None
+        return max(self.counters, key=self.counters.get)
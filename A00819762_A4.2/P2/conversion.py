@@ -0,0 +1,154 @@
+"""
+Table-driven binary/hexadecimal conversion engine for convertNumbers.py.
+
+The strings for every byte value are computed once at import time, so
+values below 256 (everything the default 8-bit mode produces) are a single
+tuple lookup. Wider values go through format(), which is faster for them
+than splitting into bytes and joining table strings.
+
+convert_batch converts a whole batch of integers for a ConversionMode
+(bit width, two's-complement padding, extra base-N column). With NumPy the
+reduction and digit extraction run as array operations over the batch;
+without it the batch goes through map() over C-level builtins.
+"""
+from itertools import repeat
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DIGITS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+SUPPORTED_BITS = (8, 16, 32, 64)
+
+# format() specs for the bases it knows natively
+FORMAT_SPECS = {2: 'b', 8: 'o', 16: 'X'}
+
+# Binary and hexadecimal strings of every byte value
+BINARY_TABLE = tuple(format(value, 'b') for value in range(256))
+HEX_TABLE = tuple(format(value, 'X') for value in range(256))
+
+
+def to_base(n: int, base: int, width: int = 0) -> str:
+    """
+    Converts a non-negative integer to any base from 2 to 36, left-padded
+    with zeros to `width` digits.
+    """
+    if base in FORMAT_SPECS:
+        return format(n, f"0{width}{FORMAT_SPECS[base]}")
+
+    digits = []
+    while n:
+        n, digit = divmod(n, base)
+        digits.append(DIGITS[digit])
+    return "".join(reversed(digits)).rjust(max(width, 1), "0")
+
+
+class ConversionMode(NamedTuple):
+    """
+    How numbers are converted: values are reduced modulo 2**bits (the
+    two's-complement bit pattern of negative numbers); twos_complement pads
+    every representation to the full width; base adds an extra column in
+    that base (8 for octal).
+    """
+    bits: int = 8
+    twos_complement: bool = False
+    base: Optional[int] = None
+
+    def width(self, base: int) -> int:
+        """
+        Digits to pad to in the given base (0 means no padding).
+        """
+        if not self.twos_complement:
+            return 0
+        return len(to_base((1 << self.bits) - 1, base))
+
+    def bases(self) -> Tuple[int, ...]:
+        """
+        Bases of the representation columns, in output order.
+        """
+        return (2, 16) if self.base is None else (2, 16, self.base)
+
+
+DEFAULT_MODE = ConversionMode()
+
+
+def reduce_batch(numbers: Sequence[int], bits: int):
+    """
+    Reduces a batch modulo 2**bits. Returns a NumPy uint64 array when NumPy
+    is available and every number fits in 64 bits, else a list.
+    """
+    mask = (1 << bits) - 1
+    if np is not None:
+        try:
+            values = np.array(numbers, dtype=np.int64)
+        except OverflowError:
+            values = None
+        if values is not None:
+            # Casting int64 to uint64 wraps negatives modulo 2**64
+            reduced = values.astype(np.uint64)
+            if bits < 64:
+                reduced &= np.uint64(mask)
+            return reduced
+    return list(map(mask.__and__, numbers))
+
+
+def _digits_array(values, base: int, width: int) -> List[str]:
+    """
+    Vectorized conversion of a uint64 array: one column of digits per
+    position, looked up in the alphabet, then viewed as fixed-size strings.
+    """
+    size = max(width, len(to_base(int(values.max()), base)) if values.size else 1)
+    matrix = np.empty((values.size, size), dtype=np.uint8)
+    remaining = values.copy()
+    for column in range(size - 1, -1, -1):
+        matrix[:, column] = remaining % np.uint64(base)
+        remaining //= np.uint64(base)
+
+    alphabet = np.frombuffer(DIGITS.encode('ascii'), dtype=np.uint8)
+    strings = alphabet[matrix].view(f"S{size}").ravel()
+    if not width:
+        strings = np.char.lstrip(strings, b"0")
+        strings[strings == b""] = b"0"
+    return strings.astype(str).tolist()
+
+
+def digits_batch(values, base: int, width: int = 0) -> List[str]:
+    """
+    Converts a batch of non-negative values (list or uint64 array) to base.
+    """
+    is_array = np is not None and isinstance(values, np.ndarray)
+
+    # Byte-sized values (the default 8-bit mode) come straight from the tables
+    if not width and base in (2, 16):
+        if is_array:
+            largest = int(values.max()) if values.size else 0
+        else:
+            largest = max(values, default=0)
+        if largest < 256:
+            table = BINARY_TABLE if base == 2 else HEX_TABLE
+            return list(map(table.__getitem__, values.tolist() if is_array else values))
+
+    if is_array:
+        return _digits_array(values, base, width)
+    if base in FORMAT_SPECS:
+        return list(map(format, values, repeat(f"0{width}{FORMAT_SPECS[base]}")))
+    return [to_base(value, base, width) for value in values]
+
+
+def convert_batch(numbers: Sequence[int], mode: ConversionMode = DEFAULT_MODE) -> List[tuple]:
+    """
+    Converts a batch of integers. Returns one (number, reduced value,
+    binary, hexadecimal[, base-N]) row per number.
+    """
+    if mode.bits not in SUPPORTED_BITS:
+        raise ValueError(f"bits must be one of {SUPPORTED_BITS}")
+    if mode.base is not None and not 2 <= mode.base <= 36:
+        raise ValueError("base must be between 2 and 36")
+
+    reduced = reduce_batch(numbers, mode.bits)
+    columns = [digits_batch(reduced, base, mode.width(base)) for base in mode.bases()]
+    if not isinstance(reduced, list):
+        reduced = reduced.tolist()
+    return list(zip(numbers, reduced, *columns))
@@ -1,132 +1,245 @@
+import argparse
+import itertools
+import os
 import sys
 import time
 import re
-from typing import List, Tuple
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable, Iterator, List, Tuple
 
+# mmapreader.py is shared by the A4.2 programs and lives one level up
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
 
-def clean_number(line: str) -> str:
-    """
-    Cleans a line by replacing non-numeric characters with spaces.
-    """
-    line = re.sub(r'[a-zA-Z]', ' ', line)
-    line = re.sub(r'[,;:]', '.', line)
-    line = re.sub(r'[^0-9.\-]', '', line).strip()
-    return line
+from conversion import (BINARY_TABLE, DEFAULT_MODE, HEX_TABLE, SUPPORTED_BITS,
+                        ConversionMode, convert_batch, to_base)
+from mmapreader import iter_lines, split_ranges
+
+# Line cleanup at the byte level: separators become dots, letters and every
+# other byte except digits, dots and minus signs are dropped
+CLEAN_TABLE = bytes.maketrans(b',;:', b'...')
+NON_NUMERIC_BYTES = bytes(byte for byte in range(256)
+                          if byte not in b'0123456789.-,;:')
+INTEGER_PATTERN = re.compile(rb'-?[0-9]+')
+
+WRITE_BUFFER_SIZE = 2**20
+
+# Numbers converted together by convert_batch
+BATCH_SIZE = 8192
+
+# --workers mode: input bytes per shard, and shards in flight per worker
+# (bounds how much converted output waits in memory for its turn)
+SHARD_SIZE = 4 * 2**20
+SHARDS_IN_FLIGHT = 2
 
 
 def decimal_to_binary(n: int) -> str:
     """
-    Converts a decimal number to binary using basic division algorithm.
+    Converts a decimal number to binary; negative numbers keep their sign.
     """
-    if n == 0:
-        return "0"
+    magnitude = abs(n)
+    binary = BINARY_TABLE[magnitude] if magnitude < 256 else to_base(magnitude, 2)
+    return f"-{binary}" if n < 0 else binary
 
-    binary = ""
-    is_negative = n < 0
-    n = abs(n)
 
-    while n > 0:
-        binary = str(n % 2) + binary
-        n //= 2
-
-    return f"-{binary}" if is_negative else binary
+def decimal_to_hexadecimal(n: int) -> str:
+    """
+    Converts a decimal number to hexadecimal; negative numbers keep their sign.
+    """
+    magnitude = abs(n)
+    hexadecimal = HEX_TABLE[magnitude] if magnitude < 256 else to_base(magnitude, 16)
+    return f"-{hexadecimal}" if n < 0 else hexadecimal
 
 
-def decimal_to_hexadecimal(n: int) -> str:
+def parse_integers(lines: Iterable[bytes],
+                   report: Callable[[str], None] = print) -> Iterator[int]:
     """
-    Converts a decimal number to hexadecimal using basic division algorithm.
+    Yields the integer found in each line (bytes), skipping invalid lines.
+    Lines are only decoded when they have to be reported.
     """
-    if n == 0:
-        return "0"
+    for line in lines:
+        cleaned_line = line.translate(CLEAN_TABLE, NON_NUMERIC_BYTES)
 
-    hex_chars = "0123456789ABCDEF"
-    hexadecimal = ""
-    is_negative = n < 0
-    n = abs(n)
+        # Ensure it's a valid integer
+        if cleaned_line and INTEGER_PATTERN.fullmatch(cleaned_line):
+            yield int(cleaned_line)
+        else:
+            text = line.decode('utf-8', errors='replace').strip()
+            report(f"Skipping invalid line: '{text}'")
 
-    while n > 0:
-        hexadecimal = hex_chars[n % 16] + hexadecimal
-        n //= 16
 
-    return f"-{hexadecimal}" if is_negative else hexadecimal
+def iter_conversions(filename: str, mode: ConversionMode = DEFAULT_MODE) -> Iterator[tuple]:
+    """
+    Yields one (number, reduced value, binary, hexadecimal[, base-N]) row
+    per valid line, converting BATCH_SIZE numbers at a time and without
+    keeping earlier rows. Raises FileNotFoundError.
+    """
+    numbers = parse_integers(iter_lines(filename))
+    while True:
+        batch = list(itertools.islice(numbers, BATCH_SIZE))
+        if not batch:
+            return
+        yield from convert_batch(batch, mode)
 
 
-def process_numbers(filename: str) -> List[Tuple[int, int, str, str]]:
+def column_widths(mode: ConversionMode = DEFAULT_MODE) -> Tuple[int, ...]:
     """
-    Reads a file, processes numbers, and converts them to binary and hexadecimal.
+    Column widths of the results table; wider modes get wider columns.
     """
-    results = []
+    largest = (1 << mode.bits) - 1
+    widths = [5, 10, max(10, len(str(largest))),
+              max(20, len(to_base(largest, 2))), max(10, len(to_base(largest, 16)))]
+    if mode.base is not None:
+        widths.append(max(10, len(to_base(largest, mode.base))))
+    return tuple(widths)
 
-    try:
-        with open(filename, 'r', encoding='utf-8') as file:
-            for line in file:
-                cleaned_line = clean_number(line)
-
-                # Ensure it's a valid integer
-                if cleaned_line and re.fullmatch(r'-?\d+', cleaned_line):
-                    try:
-                        num = int(cleaned_line)
-                        bin_value = num % 256
-                        binary = decimal_to_binary(bin_value)
-                        hexadecimal = decimal_to_hexadecimal(bin_value)
-                        results.append((num, bin_value, binary, hexadecimal))
-                    except ValueError:
-                        print(f"Skipping invalid data: '{line.strip()}'")
-                else:
-                    print(f"Skipping invalid line: '{line.strip()}'")
 
-    except FileNotFoundError:
-        print(f"Error: File '{filename}' not found.")
-        sys.exit(1)
+def header_line(mode: ConversionMode = DEFAULT_MODE) -> str:
+    """
+    Header of the results table for a conversion mode.
+    """
+    names = ['ITEM', 'TC1', 'BIN', 'Binary', 'Hexadecimal']
+    if mode.base is not None:
+        names.append('Octal' if mode.base == 8 else f'Base{mode.base}')
+    return " ".join(f"{name:<{width}}" for name, width in zip(names, column_widths(mode)))
 
-    if not results:
-        print("Error: No valid numbers found in the file.")
-        sys.exit(1)
 
-    return results
+def row_template(mode: ConversionMode = DEFAULT_MODE) -> str:
+    """
+    str.format template of one results row without its ITEM number, built
+    once per run.
+    """
+    return " ".join(f"{{:<{width}}}" for width in column_widths(mode)[1:])
 
 
-def save_results(filename: str, results: List[Tuple[int, int, str, str]], elapsed_time: float) -> None:
+def convert_shard(filename: str, start: int, end: int,
+                  mode: ConversionMode) -> Tuple[List[str], List[str]]:
     """
-    Saves the converted numbers to a file.
+    Worker task: converts the lines of one byte range. Returns the skip
+    messages and the formatted rows (without ITEM numbers, which depend on
+    the shards before this one).
     """
-    with open(filename, 'w', encoding='utf-8') as file:
-        file.write(f"{'ITEM':<5} {'TC1':<10} {'BIN':<10} {'Binary':<20} {'Hexadecimal':<10}\n")
-        file.write("=" * 60 + "\n")
+    messages = []
+    template = row_template(mode)
+    numbers = list(parse_integers(iter_lines(filename, start, end), messages.append))
+    bodies = [template.format(*row) for row in convert_batch(numbers, mode)] if numbers else []
+    return messages, bodies
 
-        for idx, (num, bin_value, binary, hex_value) in enumerate(results, start=1):
-            file.write(f"{idx:<5} {num:<10} {bin_value:<10} {binary:<20} {hex_value:<10}\n")
 
-        file.write("=" * 60 + "\n")
-        file.write(f"Execution Time: {elapsed_time:.6f} seconds\n")
+def iter_row_bodies(filename: str, mode: ConversionMode) -> Iterator[str]:
+    """
+    Yields the formatted rows (without ITEM numbers) of a file in order.
+    """
+    template = row_template(mode)
+    for row in iter_conversions(filename, mode):
+        yield template.format(*row)
 
 
-def main() -> None:
+def iter_row_bodies_parallel(filename: str, mode: ConversionMode, workers: int) -> Iterator[str]:
     """
-    Main function
+    Same as iter_row_bodies, but line-aligned shards of the file are
+    converted in a process pool. Shards are consumed in file order, so rows
+    and skip messages come out in their original order; only a few shards
+    per worker are submitted ahead of the one being written.
+    """
+    shards = split_ranges(filename, max(workers, os.path.getsize(filename) // SHARD_SIZE))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for start, end in shards:
+            pending.append(executor.submit(convert_shard, filename, start, end, mode))
+            if len(pending) < workers * SHARDS_IN_FLIGHT:
+                continue
+            messages, bodies = pending.popleft().result()
+            for message in messages:
+                print(message)
+            yield from bodies
+
+        while pending:
+            messages, bodies = pending.popleft().result()
+            for message in messages:
+                print(message)
+            yield from bodies
+
+
+def stream_results(input_filename: str, output_filename: str, echo: bool = True,
+                   mode: ConversionMode = DEFAULT_MODE, workers: int = 1) -> None:
     """
-    if len(sys.argv) != 2:
-        print("Usage: python convertNumbers.py <filename>")
+    Converts the input and writes every row to the results file as soon as it
+    is produced, through a large write buffer. Each row is formatted once and
+    the same string is echoed to the console unless echo is False, so memory
+    stays flat however long the input is. With workers > 1 the input is
+    converted in parallel shards that are merged back in line order.
+    """
+    start_time = time.time()
+    header = header_line(mode)
+    rule = max(60, len(header))
+
+    try:
+        if workers > 1:
+            bodies = iter_row_bodies_parallel(input_filename, mode, workers)
+        else:
+            bodies = iter_row_bodies(input_filename, mode)
+        first = next(bodies, None)
+    except FileNotFoundError:
+        print(f"Error: File '{input_filename}' not found.")
         sys.exit(1)
 
-    input_filename = sys.argv[1]
-    start_time = time.time()
+    if first is None:
+        print("Error: No valid numbers found in the file.")
+        sys.exit(1)
 
-    results = process_numbers(input_filename)
+    if echo:
+        print(header)
+        print("-" * rule)
 
-    elapsed_time = time.time() - start_time
+    with open(output_filename, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as file:
+        file.write(header + "\n")
+        file.write("=" * rule + "\n")
 
-    # Print results to console
-    print(f"{'ITEM':<5} {'TC1':<10} {'BIN':<10} {'Binary':<20} {'Hexadecimal':<10}")
-    print("-" * 60)
-    for idx, (num, bin_value, binary, hex_value) in enumerate(results, start=1):
-        print(f"{idx:<5} {num:<10} {bin_value:<10} {binary:<20} {hex_value:<10}")
+        for idx, body in enumerate(itertools.chain([first], bodies), start=1):
+            line = f"{idx:<5} {body}"
+            file.write(line + "\n")
+            if echo:
+                print(line)
+
+        elapsed_time = time.time() - start_time
+        file.write("=" * rule + "\n")
+        file.write(f"Execution Time: {elapsed_time:.6f} seconds\n")
 
-    print("-" * 60)
+    if echo:
+        print("-" * rule)
     print(f"Execution Time: {elapsed_time:.6f} seconds")
 
-    # Save results to file
-    save_results("ConvertionResults.txt", results, elapsed_time)
+
+def main() -> None:
+    """
+    Main function
+    """
+    parser = argparse.ArgumentParser(
+        prog="convertNumbers.py",
+        description="Converts the numbers of a file to binary and hexadecimal.")
+    parser.add_argument("filename")
+    parser.add_argument(
+        "--quiet", action="store_true",
+        help="do not echo every row to the console; only write ConvertionResults.txt")
+    parser.add_argument(
+        "--bits", type=int, choices=SUPPORTED_BITS, default=8,
+        help="reduce numbers modulo 2**BITS (default 8, i.e. num %% 256)")
+    parser.add_argument(
+        "--twos-complement", action="store_true",
+        help="print full-width two's-complement patterns, zero-padded to BITS")
+    parser.add_argument(
+        "--base", type=int, choices=range(2, 37), metavar="{2..36}",
+        help="add a column in this base (8 for octal)")
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="convert line-aligned shards of the file in N processes")
+    args = parser.parse_args()
+
+    mode = ConversionMode(args.bits, args.twos_complement, args.base)
+    stream_results(args.filename, "ConvertionResults.txt", echo=not args.quiet,
+                   mode=mode, workers=args.workers)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,116 @@
+"""
+Scaling benchmark of the word counter of wordCount.py.
+
+The bundled TC1-TC5 texts are replicated into files of growing size and
+counted by:
+  linear  the original counter, which scans a list of (word, count) tuples
+          for every word (O(words x distinct words))
+  hash    count_words, the Counter-based engine wordCount.py uses now
+
+With --grow-vocabulary every copy of the texts gets its own letter suffix,
+so the number of distinct words grows with the file as it does on real
+corpora. The linear counter is skipped once a run would exceed --limit
+seconds.
+
+Usage: python benchmarkWordCount.py [--copies 1 10 100 ...] [--grow-vocabulary]
+"""
+import argparse
+import glob
+import os
+import re
+import string
+import tempfile
+import time
+
+# wordCount puts the shared A4.2 folder (mmapreader) on sys.path
+from wordCount import count_words, iter_words
+from mmapreader import iter_lines
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def linear_count(filename):
+    """
+    The counting loop wordCount.py started with.
+    """
+    word_count = []
+    words_list = list(iter_words(iter_lines(filename)))
+    for word in words_list:
+        found = False
+        for i in range(len(word_count)):
+            if word_count[i][0] == word:
+                word_count[i] = (word, word_count[i][1] + 1)
+                found = True
+                break
+        if not found:
+            word_count.append((word, 1))
+    return dict(word_count)
+
+
+def suffix(copy):
+    """
+    Letters-only suffix for copy number `copy` (a, b, ..., z, ba, bb, ...).
+    """
+    letters = ""
+    while True:
+        copy, digit = divmod(copy, 26)
+        letters = string.ascii_lowercase[digit] + letters
+        if not copy:
+            return letters
+
+
+def build_input(path, copies, grow_vocabulary):
+    """
+    Writes `copies` copies of the TC texts to path; returns its size.
+    """
+    corpus = b"\n".join(open(name, 'rb').read()
+                        for name in sorted(glob.glob(os.path.join(HERE, "TC?.txt"))))
+    with open(path, 'wb') as file:
+        for copy in range(copies):
+            if grow_vocabulary:
+                tag = suffix(copy).encode('ascii')
+                file.write(re.sub(rb"([A-Za-z]+)", rb"\1" + tag, corpus))
+            else:
+                file.write(corpus)
+            file.write(b"\n")
+    return os.path.getsize(path)
+
+
+def main():
+    """
+    Times both counters on files of growing size and checks they agree.
+    """
+    parser = argparse.ArgumentParser(prog="benchmarkWordCount.py")
+    parser.add_argument("--copies", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--grow-vocabulary", action="store_true")
+    parser.add_argument("--limit", type=float, default=60.0)
+    args = parser.parse_args()
+
+    print(f"{'copies':>7} {'MB':>8} {'distinct':>9} {'linear s':>10} {'hash s':>8}")
+    linear_allowed = True
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "corpus.txt")
+        for copies in args.copies:
+            size = build_input(path, copies, args.grow_vocabulary)
+
+            start = time.perf_counter()
+            counts = count_words(path)
+            hash_seconds = time.perf_counter() - start
+
+            linear_text = "skipped"
+            if linear_allowed:
+                start = time.perf_counter()
+                linear = linear_count(path)
+                linear_seconds = time.perf_counter() - start
+                linear_text = f"{linear_seconds:.3f}"
+                if linear != dict(counts):
+                    print("Mismatch between counters")
+                # Assume at least linear growth for the next size
+                linear_allowed = linear_seconds * 10 <= args.limit
+
+            print(f"{copies:>7} {size / 2**20:>8.1f} {len(counts):>9} "
+                  f"{linear_text:>10} {hash_seconds:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Space-Saving heavy-hitters summary used by wordCount.py --approximate.
+"""
+import heapq
+from typing import Dict, Hashable, List, Tuple
+
+
+class SpaceSaving:
+    """
+    Keeps at most `capacity` counters whatever the vocabulary size
+    (Metwally et al.). When a new word arrives and the table is full, the
+    word with the smallest counter is evicted and the newcomer inherits its
+    count plus one. Counts are upper bounds: a word's true frequency is at
+    least count - error, and every word that occurs more than
+    total / capacity times is guaranteed to be kept.
+    """
+
+    def __init__(self, capacity: int = 10000) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.total = 0
+        self.counts: Dict[Hashable, int] = {}
+        self.errors: Dict[Hashable, int] = {}
+        # (count, word) entries; may hold stale counts, refreshed lazily
+        self._heap: List[Tuple[int, Hashable]] = []
+
+    def add(self, word: Hashable) -> None:
+        """
+        Counts one occurrence of word.
+        """
+        self.total += 1
+        counts = self.counts
+        if word in counts:
+            counts[word] += 1
+            return
+        if len(counts) < self.capacity:
+            counts[word] = 1
+            self.errors[word] = 0
+            heapq.heappush(self._heap, (1, word))
+            return
+
+        # Find the real minimum: refresh heap entries whose count went up
+        heap = self._heap
+        while True:
+            count, victim = heap[0]
+            if counts[victim] == count:
+                break
+            heapq.heapreplace(heap, (counts[victim], victim))
+
+        del counts[victim]
+        del self.errors[victim]
+        counts[word] = count + 1
+        self.errors[word] = count
+        heapq.heapreplace(heap, (count + 1, word))
+
+    def top(self, k: int = 0) -> List[Tuple[Hashable, int]]:
+        """
+        The k words with the largest counters (all of them when k is 0),
+        most frequent first.
+        """
+        items = self.counts.items()
+        if k:
+            return heapq.nlargest(k, items, key=lambda item: item[1])
+        return sorted(items, key=lambda item: item[1], reverse=True)
+
+    def max_error(self) -> int:
+        """
+        Largest overestimate among the reported counters.
+        """
+        return max(self.errors.values(), default=0)
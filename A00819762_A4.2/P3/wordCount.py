@@ -1,7 +1,44 @@
+import argparse
+import glob
+import json
+import os
 import sys
 import time
 import re
-from typing import List, Tuple
+import string
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# mmapreader.py is shared by the A4.2 programs and lives one level up
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from heavyhitters import SpaceSaving
+from mmapreader import complete_lines_end, iter_blocks, read_fingerprint, split_ranges
+
+# --incremental mode keeps the merged counts and the bytes already read of
+# every input here, next to WordCountResults.txt
+INDEX_FILE = "WordCountResults.index.json"
+INDEX_VERSION = 1
+
+# Parallel mode: target bytes per chunk, and chunks per worker for balance
+CHUNK_SIZE = 8 * 2**20
+CHUNKS_PER_WORKER = 4
+
+# str.split() also breaks on the ASCII separators \x1c-\x1f; bytes.split()
+# does not, so they are turned into spaces first
+SEPARATORS = b'\x1c\x1d\x1e\x1f'
+SEPARATOR_TABLE = bytes.maketrans(SEPARATORS, b'    ')
+NON_LETTER_BYTES = bytes(byte for byte in range(256)
+                         if byte not in string.ascii_letters.encode('ascii'))
+
+# Bulk tokenizer: one translate per block lowercases letters, turns the
+# separators into spaces and deletes every other non-letter, non-space byte,
+# so "don't" becomes "dont" exactly as with clean_word
+TOKEN_TABLE = bytes.maketrans(string.ascii_uppercase.encode('ascii') + SEPARATORS,
+                              string.ascii_lowercase.encode('ascii') + b'    ')
+TOKEN_DELETE = bytes(byte for byte in NON_LETTER_BYTES
+                     if byte not in string.whitespace.encode('ascii') + SEPARATORS)
 
 def clean_word(word: str) -> str:
     """
@@ -9,46 +46,263 @@ def clean_word(word: str) -> str:
     """
     return re.sub(r'[^a-zA-Z]', '', word).lower()
 
-def process_words(filename: str) -> Tuple[List[Tuple[str, int]], int]:
+
+def iter_words(lines: Iterable[bytes]) -> Iterator[str]:
+    """
+    Yields the cleaned words of each line (bytes). ASCII lines are cleaned
+    without decoding; other lines are decoded so Unicode whitespace still
+    separates words as in str.split().
+    """
+    for line in lines:
+        if line.isascii():
+            for word in line.translate(SEPARATOR_TABLE).split():
+                clean = word.translate(None, NON_LETTER_BYTES).lower()
+                if clean:
+                    yield clean.decode('ascii')
+        else:
+            for word in line.decode('utf-8', errors='replace').split():
+                clean = clean_word(word)
+                if clean:
+                    yield clean
+
+
+def tokenize_block(block: bytes) -> List[str]:
+    """
+    Returns the cleaned words of a block of lines. An ASCII block is cleaned
+    with one translate and split once, with no per-word work; a block with
+    other bytes goes line by line through iter_words.
+    """
+    if block.isascii():
+        return block.translate(TOKEN_TABLE, TOKEN_DELETE).decode('ascii').split()
+    return list(iter_words(block.splitlines()))
+
+
+def iter_tokens(blocks: Iterable[bytes]) -> Iterator[str]:
+    """
+    Yields the cleaned words of each block, in order.
+    """
+    for block in blocks:
+        yield from tokenize_block(block)
+
+
+def count_words(filename: str, start: int = 0, end: Optional[int] = None) -> Counter:
+    """
+    Counts the words of a file (or of its byte range [start, end)) in a hash
+    table while reading it, one block's words at a time.
+    Raises FileNotFoundError.
+    """
+    word_count = Counter()
+    for block in iter_blocks(filename, start, end):
+        word_count.update(tokenize_block(block))
+    return word_count
+
+
+def expand_inputs(paths: Sequence[str]) -> List[str]:
+    """
+    Expands directories (recursively) and glob patterns into a sorted list
+    of files; plain names are kept as given.
+    """
+    filenames = []
+    for path in paths:
+        if os.path.isdir(path):
+            for folder, _, names in sorted(os.walk(path)):
+                filenames.extend(os.path.join(folder, name) for name in sorted(names))
+        elif glob.has_magic(path):
+            filenames.extend(sorted(glob.glob(path)))
+        else:
+            filenames.append(path)
+    return filenames
+
+
+def plan_chunks(filenames: Sequence[str], workers: int) -> List[Tuple[str, int, int]]:
+    """
+    Splits every file into whitespace-aligned byte ranges, sized so there
+    are about CHUNKS_PER_WORKER chunks per worker (and none much bigger
+    than CHUNK_SIZE). Raises FileNotFoundError.
+    """
+    sizes = [os.path.getsize(filename) for filename in filenames]
+    chunk_size = min(CHUNK_SIZE, max(1, sum(sizes) // (workers * CHUNKS_PER_WORKER)))
+
+    chunks = []
+    for filename, size in zip(filenames, sizes):
+        parts = max(1, -(-size // chunk_size))
+        chunks.extend((filename, start, end)
+                      for start, end in split_ranges(filename, parts, at_whitespace=True))
+    return chunks
+
+
+def count_corpus(filenames: Sequence[str], workers: int) -> Counter:
+    """
+    Map-reduce word count over several files: whitespace-aligned chunks are
+    counted in a process pool (map) and their counters are added up in the
+    parent as they arrive. Raises FileNotFoundError.
+    """
+    chunks = plan_chunks(filenames, workers)
+    word_count: Counter = Counter()
+    if not chunks:
+        return word_count
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # map yields in chunk order, so words keep first-seen order, and each
+        # counter is merged while the workers go on with later chunks
+        for counts in executor.map(count_words, *zip(*chunks)):
+            word_count.update(counts)
+    return word_count
+
+
+def load_index(index_path: str) -> Tuple[dict, Counter]:
+    """
+    Loads the saved index: ({path: {"offset", "fingerprint"}}, word counts).
+    A missing or unreadable index just means starting from scratch.
+    """
+    try:
+        with open(index_path, 'r', encoding='utf-8') as file:
+            index = json.load(file)
+    except FileNotFoundError:
+        return {}, Counter()
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        print(f"Warning: '{index_path}' is corrupted; rescanning.")
+        return {}, Counter()
+
+    if index.get("version") != INDEX_VERSION:
+        return {}, Counter()
+    return index.get("files", {}), Counter(index.get("counts", {}))
+
+
+def save_index(index_path: str, files: dict, word_count: Counter) -> None:
+    """
+    Writes the index atomically, so an interrupted run keeps the previous
+    one. Words keep first-seen order, so ties list the same way next time.
+    """
+    temp_path = index_path + ".tmp"
+    with open(temp_path, 'w', encoding='utf-8') as file:
+        json.dump({"version": INDEX_VERSION, "files": files, "counts": word_count},
+                  file, separators=(',', ':'))
+    os.replace(temp_path, index_path)
+
+
+def is_appended(filename: str, saved: dict) -> bool:
+    """
+    True when a file still holds the bytes indexed last time (it was only
+    appended to).
+    """
+    return (saved["offset"] <= os.path.getsize(filename)
+            and read_fingerprint(filename, saved["offset"]) == saved["fingerprint"])
+
+
+def count_incremental(filenames: Sequence[str], index_path: str = INDEX_FILE) -> Counter:
+    """
+    Merges the words added to each file since the previous run into the
+    saved index and returns the counts of the whole indexed corpus. Files
+    indexed before but not given now keep their counts. If an indexed file
+    was rewritten rather than appended to, the counts cannot be taken back,
+    so every indexed file still present is counted again.
+    """
+    for filename in filenames:
+        if not os.path.isfile(filename):
+            print(f"Error: File '{filename}' not found.")
+            sys.exit(1)
+
+    files, word_count = load_index(index_path)
+    sources = list(filenames)
+    changed = [key for key, saved in files.items()
+               if os.path.isfile(key) and not is_appended(key, saved)]
+    if changed:
+        print(f"Warning: '{changed[0]}' changed since the last run; rebuilding the index.")
+        known = {os.path.abspath(filename) for filename in filenames}
+        sources = [key for key in files if os.path.isfile(key) and key not in known] + sources
+        files, word_count = {}, Counter()
+
+    # Only complete lines are indexed; a line still being written is counted
+    # in this run's results but read again next time
+    tails = []
+    for filename in sources:
+        key = os.path.abspath(filename)
+        offset = files[key]["offset"] if key in files else 0
+        end = complete_lines_end(filename, offset)
+        word_count.update(count_words(filename, offset, end))
+        files[key] = {"offset": end, "fingerprint": read_fingerprint(filename, end)}
+        tails.append((filename, end))
+    save_index(index_path, files, word_count)
+
+    for filename, end in tails:
+        word_count.update(count_words(filename, end))
+    return word_count
+
+
+def query_index(words: Sequence[str], index_path: str = INDEX_FILE) -> List[Tuple[str, int]]:
+    """
+    Looks words up in the saved index without reading any text. Words are
+    cleaned like the text was, so "Don't" finds "dont".
+    """
+    if not os.path.isfile(index_path):
+        print(f"Error: No index found in '{index_path}'; run with --incremental first.")
+        sys.exit(1)
+
+    _, word_count = load_index(index_path)
+    return [(word, word_count.get(clean_word(word), 0)) for word in words]
+
+
+def process_words(filename: str, top: int = 0) -> Tuple[List[Tuple[str, int]], int]:
     """
     Reads a file, processes words, and counts their frequency.
+    With top > 0 only the `top` most frequent words are returned; they are
+    picked with a bounded heap instead of sorting the whole vocabulary.
+    """
+    return process_corpus([filename], 1, top)
+
+
+def process_corpus(filenames: Sequence[str], workers: int = 1, top: int = 0,
+                   incremental: bool = False) -> Tuple[List[Tuple[str, int]], int]:
+    """
+    Counts the words of several files as one corpus, in parallel when
+    workers > 1, or from the saved index plus the new bytes when
+    incremental. Returns the same rows as process_words.
+    """
+    try:
+        if incremental:
+            word_count = count_incremental(filenames)
+        elif workers > 1:
+            word_count = count_corpus(filenames, workers)
+        else:
+            word_count = Counter()
+            for filename in filenames:
+                word_count.update(count_words(filename))
+    except FileNotFoundError as error:
+        print(f"Error: File '{error.filename}' not found.")
+        sys.exit(1)
+
+    if not word_count:
+        print("Error: No valid words found in the file.")
+        sys.exit(1)
+
+    # Counter keeps first-seen order and most_common() sorts stably, so ties
+    # are listed in the same order as before
+    return word_count.most_common(top or None), sum(word_count.values())
+
+
+def process_words_approximate(filename: str, capacity: int,
+                              top: int = 0) -> Tuple[List[Tuple[str, int]], int, int]:
+    """
+    Counts the most frequent words of a file in a Space-Saving summary of
+    `capacity` counters, so memory stays bounded on streams with unbounded
+    vocabulary. Returns (rows, total words, largest overestimate).
     """
-    word_count = []
-    words_list = []
-    total_words = 0 
+    summary = SpaceSaving(capacity)
     try:
-        with open(filename, 'r', encoding='utf-8') as file:
-            for line in file:
-                # Split the line into words
-                words = line.strip().split()
-
-                for word in words:
-                    clean = clean_word(word)
-                    if clean: 
-                        words_list.append(clean)
-                        total_words += 1 
-        # Manually count word occurrences
-        for word in words_list:
-            found = False
-            for i in range(len(word_count)):
-                if word_count[i][0] == word:
-                    word_count[i] = (word, word_count[i][1] + 1)
-                    found = True
-                    break
-            if not found:
-                word_count.append((word, 1))
+        for word in iter_tokens(iter_blocks(filename)):
+            summary.add(word)
     except FileNotFoundError:
         print(f"Error: File '{filename}' not found.")
         sys.exit(1)
 
-    if not word_count:
+    if not summary.total:
         print("Error: No valid words found in the file.")
         sys.exit(1)
 
-    return sorted(word_count, key=lambda x: x[1], reverse=True), total_words
+    return summary.top(top), summary.total, summary.max_error()
 
-def save_results(filename: str, results: List[Tuple[str, int]], 
-                 total_words: int, elapsed_time: float) -> None:
+def save_results(filename: str, results: List[Tuple[str, int]],
+                 total_words: int, elapsed_time: float, max_error: int = 0) -> None:
     """
     Saves the word count results to a file.
     """
@@ -59,20 +313,70 @@ def save_results(filename: str, results: List[Tuple[str, int]],
             file.write(f"{word:<15} {count:<10}\n")
         file.write("-" * 30 + "\n")
         file.write(f"Total Words: {total_words}\n")
+        if max_error:
+            file.write(f"Frequencies are estimates, at most {max_error} above the true count\n")
         file.write(f"Execution Time: {elapsed_time:.6f} seconds\n")
 
 def main() -> None:
     """
     Main function
     """
-    if len(sys.argv) != 2:
-        print("Usage: python wordCount.py <filename>")
+    parser = argparse.ArgumentParser(
+        prog="wordCount.py", description="Counts the frequency of the words of a file.")
+    parser.add_argument(
+        "filenames", nargs="*", metavar="filename",
+        help="text file; several files, glob patterns or directories are "
+             "counted together as one corpus")
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="count whitespace-aligned chunks in N processes and add up "
+             "their counters as they arrive")
+    parser.add_argument(
+        "--incremental", action="store_true",
+        help=f"read only the bytes appended since the last run and merge "
+             f"them into the word counts saved in {INDEX_FILE}")
+    parser.add_argument(
+        "--query", nargs="+", metavar="WORD",
+        help=f"print the counts of WORD... from {INDEX_FILE} without reading "
+             f"any text")
+    parser.add_argument(
+        "--top", type=int, default=0, metavar="K",
+        help="only list the K most frequent words")
+    parser.add_argument(
+        "--approximate", type=int, metavar="CAPACITY",
+        help="count heavy hitters in a Space-Saving summary of CAPACITY "
+             "counters; memory stays bounded, counts may be overestimated")
+    args = parser.parse_args()
+
+    if args.query:
+        if args.filenames:
+            parser.error("--query reads the index only; no files are needed")
+        print(f"{'Word':<15} {'Frequency':<10}")
+        for word, count in query_index(args.query):
+            print(f"{word:<15} {count:<10}")
+        return
+    if not args.filenames:
+        parser.error("the following arguments are required: filename")
+
+    filenames = expand_inputs(args.filenames)
+    if args.approximate and (len(filenames) != 1 or args.workers > 1 or args.incremental):
+        parser.error("--approximate works on a single file without --workers "
+                     "or --incremental")
+    if args.incremental and args.workers > 1:
+        parser.error("--incremental reads only new bytes and does not use --workers")
+    if not filenames:
+        print("Error: No input files found.")
         sys.exit(1)
 
-    input_filename = sys.argv[1]
     start_time = time.time()
 
-    results, total_words = process_words(input_filename)
+    max_error = 0
+    if args.approximate:
+        results, total_words, max_error = process_words_approximate(
+            filenames[0], args.approximate, args.top)
+    else:
+        results, total_words = process_corpus(filenames, args.workers, args.top,
+                                              args.incremental)
 
     elapsed_time = time.time() - start_time
 
@@ -81,9 +385,11 @@ def main() -> None:
     for word, count in results:
         print(f"{word:<15} {count:<10}")
     print(f"Total Words: {total_words}")
+    if max_error:
+        print(f"Frequencies are estimates, at most {max_error} above the true count")
     print(f"Execution Time: {elapsed_time:.6f} seconds")
     # Save results to file
-    save_results("WordCountResults.txt", results, total_words, elapsed_time)
+    save_results("WordCountResults.txt", results, total_words, elapsed_time, max_error)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,110 @@
+"""
+Memory-mapped line reader shared by computeStatistics.py, convertNumbers.py
+and wordCount.py.
+
+Lines come out as bytes: nothing is decoded unless a program needs the text
+(for example to report a rejected line), and the file is read through the
+page cache instead of a Python text buffer.
+"""
+import mmap
+import os
+import re
+
+# Lines are cut out of blocks of about this size
+BLOCK_SIZE = 2**20
+
+# ASCII whitespace; these bytes never occur inside a multi-byte UTF-8 character
+WHITESPACE = re.compile(rb'[ \t\n\r\x0b\x0c]')
+
+# Bytes remembered before a saved offset to notice rewritten files
+FINGERPRINT_SIZE = 64
+
+
+def _after_whitespace(file, size):
+    """
+    Moves past the next whitespace byte and returns the new offset (size if
+    there is none).
+    """
+    while True:
+        offset = file.tell()
+        chunk = file.read(BLOCK_SIZE)
+        if not chunk:
+            return size
+        match = WHITESPACE.search(chunk)
+        if match:
+            return offset + match.end()
+
+
+def split_ranges(filename, parts, at_whitespace=False):
+    """
+    Splits a file into at most `parts` byte ranges that start and end on
+    line boundaries (or, with at_whitespace, just after any whitespace
+    byte, so even files without line breaks split without cutting words).
+    Returns a list of (start, end) offsets.
+    """
+    size = os.path.getsize(filename)
+    bounds = [0]
+    with open(filename, 'rb') as file:
+        for i in range(1, parts):
+            file.seek(size * i // parts)
+            if at_whitespace:
+                offset = _after_whitespace(file, size)
+            else:
+                file.readline()  # Move to the start of the next line
+                offset = file.tell()
+            if bounds[-1] < offset < size:
+                bounds.append(offset)
+    bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+
+def complete_lines_end(filename, start=0):
+    """
+    Returns the offset just after the last line break at or after `start`,
+    or `start` when no complete line follows it. Bytes past that offset
+    belong to a line that is still being written.
+    """
+    with open(filename, 'rb') as file:
+        if os.fstat(file.fileno()).st_size <= start:
+            return start
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            cut = view.rfind(b'\n', start)
+            return start if cut == -1 else cut + 1
+
+
+def read_fingerprint(filename, offset):
+    """
+    Returns the hex of the bytes right before offset, used to check that a
+    file was only appended to since the last run.
+    """
+    with open(filename, 'rb') as file:
+        file.seek(max(offset - FINGERPRINT_SIZE, 0))
+        return file.read(min(offset, FINGERPRINT_SIZE)).hex()
+
+
+def iter_blocks(filename, start=0, end=None, block_size=BLOCK_SIZE):
+    """
+    Yields bytes blocks of the range [start, end) of a file, each ending on a
+    line break (except possibly the last one). Raises FileNotFoundError like
+    open().
+    """
+    with open(filename, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            end = len(view) if end is None else min(end, len(view))
+            position = start
+            while position < end:
+                cut = view.find(b'\n', min(position + block_size, end) - 1, end)
+                cut = end if cut == -1 else cut + 1
+                yield view[position:cut]
+                position = cut
+
+
+def iter_lines(filename, start=0, end=None):
+    """
+    Yields the lines of the range [start, end) of a file as bytes, without
+    their line break. '\\n', '\\r\\n' and '\\r' all end a line, as in text mode.
+    """
+    for block in iter_blocks(filename, start, end):
+        yield from block.splitlines()
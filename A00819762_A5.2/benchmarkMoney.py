@@ -0,0 +1,93 @@
+"""
+Benchmarks the money arithmetic of computeSales.py on synthetic sales.
+
+Compares the float loop (price_sales), the integer-units loop of --money
+(price_sales_exact) and a naive loop that builds a Decimal for every sale.
+Prices come from load_product_prices, the same compiled index the command
+line uses, so the timings include its title lookups. With --fractional
+the quantities are quarters (0.25, 0.5, ...) instead of whole units.
+
+Usage: python benchmarkMoney.py [--sales N] [--seed S] [--fractional]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from decimal import ROUND_HALF_UP, Decimal
+
+from computeSales import (load_product_prices, price_sales,
+                          price_sales_exact, to_money)
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def decimal_sales(product_prices, sales_record):
+    """
+    The straightforward exact loop: one Decimal price and product per sale,
+    rounded half up to cents at the end like to_money.
+    """
+    total_cost = Decimal(0)
+    for sale in sales_record:
+        product_name = sale['Product']
+        if product_name not in product_prices:
+            continue
+        price = Decimal(repr(product_prices[product_name]))
+        quantity = sale['Quantity']
+        if not isinstance(quantity, int):
+            quantity = Decimal(repr(quantity))
+        total_cost += price * quantity
+    return total_cost.quantize(Decimal('0.01'), ROUND_HALF_UP)
+
+
+def time_call(function, *args):
+    """
+    Runs function(*args) once and returns (result, seconds).
+    """
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    """Time the three loops on the same sales and check the totals."""
+    parser = argparse.ArgumentParser(prog="benchmarkMoney.py")
+    parser.add_argument("--sales", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--fractional", action="store_true",
+                        help="use quarter quantities instead of ints")
+    args = parser.parse_args()
+
+    product_prices = load_product_prices(
+        os.path.join(HERE, "priceCatalogue.json"))
+
+    rng = random.Random(args.seed)
+    titles = list(product_prices)
+    sales_record = [{"Product": rng.choice(titles),
+                     "Quantity": (rng.randint(1, 200) / 4 if args.fractional
+                                  else rng.randint(1, 50))}
+                    for _ in range(args.sales)]
+
+    float_total, float_time = time_call(price_sales, product_prices,
+                                        sales_record)
+    (units, _), units_time = time_call(price_sales_exact,
+                                       product_prices.units, sales_record)
+    decimal_total, decimal_time = time_call(decimal_sales, product_prices,
+                                            sales_record)
+    money_total = to_money(units, product_prices.scale)
+
+    print(f"Sales: {args.sales:,}")
+    print(f"{'loop':<8} {'seconds':>10} {'total':>20}")
+    print(f"{'float':<8} {float_time:>10.3f} {float_total[0]!r:>20}")
+    print(f"{'units':<8} {units_time:>10.3f} {str(money_total):>20}")
+    print(f"{'decimal':<8} {decimal_time:>10.3f} {str(decimal_total):>20}")
+    print(f"units vs float:   {float_time / units_time:.2f}x")
+    print(f"units vs decimal: {decimal_time / units_time:.2f}x")
+
+    if money_total != decimal_total:
+        print("Mismatch between exact loops:", money_total, decimal_total)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
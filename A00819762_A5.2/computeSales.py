@@ -1,6 +1,41 @@
+import argparse
+import csv
+import glob
 import json
+import math
+import os
+import re
 import sys
 import time
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+from fractions import Fraction
+from itertools import repeat
+
+from fuzzymatch import DEFAULT_THRESHOLD, FuzzyPrices, TrigramIndex
+from priceindex import PriceTable, open_price_index
+
+# Characters read at a time by the streaming sales reader
+CHUNK_SIZE = 2**16
+
+WHITESPACE = ' \t\n\r'
+SKIP_WHITESPACE = re.compile(r'[ \t\n\r]*')
+LINE_SEPARATORS = frozenset(WHITESPACE)
+ARRAY_SEPARATORS = frozenset(WHITESPACE + ',')
+# Characters that may end a chunk in the middle of a number
+NUMBER_TAIL = re.compile(r'[0-9+\-.eE]*\Z')
+# Decode errors this close to the end of the buffer may come from an item
+# cut by the chunk boundary ("-Infinit", a partial \uXXXX escape)
+CUT_MARGIN = 12
+
+# Suffix dropped from sales file names in the batch report
+RECORD_SUFFIX = ".salesRecord.json"
+
+# Totals computed by --breakdown: per ticket, per day and per product type
+BREAKDOWNS = ("SALE_ID", "SALE_Date", "type")
+
+# Catalogue index of a batch worker, set once per process by init_worker
+_worker_prices = {}
 
 
 def load_json_file(filename):
@@ -16,61 +51,670 @@ def load_json_file(filename):
         sys.exit(1)
 
 
-def compute_total_sales(price_catalogue, sales_record):
-    """Calculate total sales cost."""
-    product_prices = {
+class JsonRecordReader:
+    """
+    Reads the items of a top-level JSON array, or the values of a JSON
+    Lines file, one at a time from a text file. Only the item being
+    decoded is buffered; iterating raises json.JSONDecodeError.
+    """
+
+    def __init__(self, file, chunk_size=CHUNK_SIZE):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ''
+        self.position = 0
+        self.at_end = False
+        self.in_array = self.closed = False
+        self.separators = LINE_SEPARATORS
+        # Array items need exactly one comma between them, as with json.load
+        self.need_comma = self.after_comma = False
+
+    def __iter__(self):
+        if self.skip_whitespace() and self.buffer[self.position] == '[':
+            self.in_array = True
+            self.separators = ARRAY_SEPARATORS
+            self.position += 1
+
+        while self.skip_whitespace():
+            if self.closed:
+                raise self.error("Extra data", self.position)
+            if self.in_array and not self.at_item():
+                continue
+            yield self.decode_item()
+            self.need_comma, self.after_comma = self.in_array, False
+
+        if self.in_array:
+            raise self.error("Expecting ']'", len(self.buffer))
+
+    def error(self, message, position):
+        """Decode error at position of the buffer."""
+        return json.JSONDecodeError(message, self.buffer, position)
+
+    def read_more(self, size):
+        """
+        Keep the buffer from the current position on and append up to size
+        more characters. Returns False at the end of the file.
+        """
+        chunk = self.file.read(size)
+        self.at_end = not chunk
+        self.buffer = self.buffer[self.position:] + chunk
+        self.position = 0
+        return not self.at_end
+
+    def skip_whitespace(self):
+        """
+        Move to the next character that is not whitespace, reading more of
+        the file as needed. Returns False at the end of the file.
+        """
+        while True:
+            self.position = SKIP_WHITESPACE.match(
+                self.buffer, self.position).end()
+            if self.position < len(self.buffer):
+                return True
+            if self.at_end or not self.read_more(self.chunk_size):
+                return False
+
+    def at_item(self):
+        """
+        Consume the ',' or ']' at the current position of the array.
+        Returns True when an item starts at the (new) position.
+        """
+        character = self.buffer[self.position]
+        if character == ']':
+            if self.after_comma:
+                raise self.error("Illegal trailing comma before end of array",
+                                 self.position)
+            self.in_array, self.closed = False, True
+            self.separators = LINE_SEPARATORS
+        elif character == ',':
+            if not self.need_comma:
+                raise self.error("Expecting value", self.position)
+            self.need_comma, self.after_comma = False, True
+            # Usually the next item follows at once; tell so without going
+            # around the caller's loop again
+            self.position = SKIP_WHITESPACE.match(
+                self.buffer, self.position + 1).end()
+            return self.buffer[self.position:self.position + 1] not in (
+                '', ',', ']')
+        elif self.need_comma:
+            raise self.error("Expecting ',' delimiter", self.position)
+        else:
+            return True
+        self.position += 1
+        return False
+
+    def may_be_cut(self, error):
+        """
+        Tell whether a decode error may only mean that the item goes on
+        past the end of the buffer: it is within CUT_MARGIN characters of
+        the end, or a string has no closing quote yet.
+        """
+        return (error.pos >= len(self.buffer) - CUT_MARGIN
+                or error.msg.startswith("Unterminated string"))
+
+    def decode_item(self):
+        """
+        Decode the item at the current position. While it may be cut by
+        the end of the buffer, read as much again as is buffered and retry,
+        so a long item costs linear time; any other error is raised at once.
+        """
+        while True:
+            try:
+                item, end = self.decoder.raw_decode(self.buffer,
+                                                    self.position)
+            except json.JSONDecodeError as error:
+                if self.at_end or not self.may_be_cut(error):
+                    raise
+                self.read_more(max(self.chunk_size, len(self.buffer)))
+                continue
+
+            # Only a separator may follow an item. A tail of number
+            # characters may still be the rest of a number cut by the
+            # chunk boundary ("4." of "4.5"), so that case reads more
+            following = self.buffer[end:end + 1]
+            if following in self.separators:
+                break
+            if not self.at_end and NUMBER_TAIL.match(self.buffer, end):
+                self.read_more(max(self.chunk_size, len(self.buffer)))
+                continue
+            if following not in ('', ']'):
+                raise self.error("Expecting ',' delimiter", end)
+            break
+
+        self.position = end
+        return item
+
+
+def iter_json_records(file, chunk_size=CHUNK_SIZE):
+    """
+    Yield the items of a top-level JSON array, or the values of a JSON
+    Lines file, one at a time (see JsonRecordReader).
+    Raises json.JSONDecodeError.
+    """
+    return iter(JsonRecordReader(file, chunk_size))
+
+
+def iter_json_file(filename):
+    """Stream the records of a JSON array or JSON Lines file."""
+    try:
+        with open(filename, 'r', encoding='utf-8') as file:
+            yield from iter_json_records(file)
+    except FileNotFoundError:
+        print(f"Error: File {filename} not found.")
+        sys.exit(1)
+    except json.JSONDecodeError:
+        print(f"Error: File {filename} invalid JSON.")
+        sys.exit(1)
+
+
+def index_catalogue(price_catalogue):
+    """Build the {title: price} lookup table of a catalogue."""
+    return {
         item['title']: item['price']
         for item in price_catalogue
     }
+
+
+def price_sales(product_prices, sales_record):
+    """
+    Price a sales record with a catalogue index. sales_record may be any
+    iterable of sales, so a streamed file is priced one sale at a time.
+    """
     total_cost = 0.0
     errors = []
+    # Prices met in this record: the catalogue lookup (a compiled index or
+    # fuzzy matching) runs once per product, later sales hit a plain dict
+    prices = {}
 
     for sale in sales_record:
         product_name = sale['Product']
         quantity = sale['Quantity']
 
-        if product_name not in product_prices:
-            errors.append(
-                f"'{product_name}' not found in catalog prices."
-            )
-            continue
+        try:
+            price = prices[product_name]
+        except KeyError:
+            try:
+                price = prices[product_name] = product_prices[product_name]
+            except KeyError:
+                errors.append(
+                    f"'{product_name}' not found in catalog prices."
+                )
+                continue
 
-        total_cost += product_prices[product_name] * quantity
+        total_cost += price * quantity
 
     return total_cost, errors
 
 
-def main():
-    """Main function to execute."""
+def decimal_scale(fraction):
+    """
+    Smallest power of ten that is a multiple of a fraction's denominator,
+    which always exists for a number written in decimal.
+    """
+    scale = 1
+    while scale % fraction.denominator:
+        scale *= 10
+    return scale
 
-    price_catalogue_file = sys.argv[1]
-    sales_record_file = sys.argv[2]
 
-    start_time = time.time()
+def price_sales_exact(product_units, sales_record):
+    """
+    Price a sales record in exact money units: catalogue prices are whole
+    numbers of 1 / scale (see priceindex.money_scale), so the total is an
+    int sum with no rounding drift. A quantity that is not an int is
+    multiplied as the exact fraction it was written as.
 
-    price_catalogue = load_json_file(price_catalogue_file)
-    sales_record = load_json_file(sales_record_file)
+    The loop only adds up each product's quantities, as ints: whole
+    quantities as they are, the others in units of 1 / quantity_scale,
+    converted once per distinct value. Prices are multiplied in once per
+    product at the end.
+    """
+    whole = {}
+    scaled = {}
+    quantity_units = {}
+    quantity_scale = 1
+    errors = []
 
-    total_cost, errors = compute_total_sales(price_catalogue, sales_record)
+    for sale in sales_record:
+        product_name = sale['Product']
+        quantity = sale['Quantity']
 
-    execution_time = time.time() - start_time
+        if isinstance(quantity, int):
+            totals = whole
+        else:
+            totals = scaled
+            try:
+                quantity = quantity_units[quantity]
+            except KeyError:
+                if product_name not in product_units:
+                    errors.append(
+                        f"'{product_name}' not found in catalog prices."
+                    )
+                    continue
+                exact = Fraction(repr(quantity))
+                scale = decimal_scale(exact)
+                if quantity_scale % scale:
+                    # A quantity with more decimals: refine the units
+                    factor = scale // math.gcd(scale, quantity_scale)
+                    quantity_scale *= factor
+                    for table in (quantity_units, scaled):
+                        for key in table:
+                            table[key] *= factor
+                quantity_units[quantity] = int(exact * quantity_scale)
+                quantity = quantity_units[quantity]
+
+        try:
+            totals[product_name] += quantity
+        except KeyError:
+            if product_name in product_units:
+                totals[product_name] = quantity
+            else:
+                errors.append(
+                    f"'{product_name}' not found in catalog prices."
+                )
+
+    total_units = sum(product_units[product_name] * quantity
+                      for product_name, quantity in whole.items())
+    if scaled:
+        total_units += Fraction(
+            sum(product_units[product_name] * quantity
+                for product_name, quantity in scaled.items()),
+            quantity_scale)
+    return total_units, errors
+
+
+def to_money(units, scale):
+    """
+    Exact amount units / scale, rounded half up to cents, as a Decimal
+    with two decimals.
+    """
+    amount = Fraction(units) * 100 / scale
+    cents = math.floor(abs(amount) + Fraction(1, 2))
+    return Decimal(f"{-cents if amount < 0 else cents}e-2")
+
+
+def aggregate_sales(product_prices, sales_record, money=False):
+    """
+    Price a sales record and, in the same pass, total it by SALE_ID,
+    SALE_Date and product type. Returns (total, errors, breakdowns) where
+    breakdowns maps each name of BREAKDOWNS to {key: total}. With money,
+    every amount is summed in exact units and returned as a Decimal.
+    """
+    amounts = product_prices.units if money else product_prices
+    by_ticket = {}
+    by_date = {}
+    by_type = {}
+    total_cost = 0 if money else 0.0
+    errors = []
+    # (price, type) of the products met in this record, looked up once
+    products = {}
+
+    for sale in sales_record:
+        product_name = sale['Product']
+        quantity = sale['Quantity']
+
+        try:
+            price, product_type = products[product_name]
+        except KeyError:
+            try:
+                price = amounts[product_name]
+            except KeyError:
+                errors.append(
+                    f"'{product_name}' not found in catalog prices."
+                )
+                continue
+            product_type = product_prices.type_of(product_name)
+            products[product_name] = price, product_type
+
+        if money and not isinstance(quantity, int):
+            quantity = Fraction(repr(quantity))
+        amount = price * quantity
+        total_cost += amount
+
+        ticket = sale.get('SALE_ID')
+        by_ticket[ticket] = by_ticket.get(ticket, 0) + amount
+        date = sale.get('SALE_Date')
+        by_date[date] = by_date.get(date, 0) + amount
+        by_type[product_type] = by_type.get(product_type, 0) + amount
+
+    breakdowns = dict(zip(BREAKDOWNS, (by_ticket, by_date, by_type)))
+    if money:
+        scale = product_prices.scale
+        total_cost = to_money(total_cost, scale)
+        breakdowns = {name: {key: to_money(amount, scale)
+                             for key, amount in totals.items()}
+                      for name, totals in breakdowns.items()}
+    return total_cost, errors, breakdowns
 
-    print("Total sales cost: ${:.2f}".format(total_cost))
-    print("Execution time: {:.4f} seconds".format(execution_time))
+
+def price_record(product_prices, sales_record, money=False):
+    """
+    Price a sales record with price_sales or, with money, with
+    price_sales_exact. Returns (total, errors); with money the total is an
+    exact Decimal.
+    """
+    if not money:
+        return price_sales(product_prices, sales_record)
+    units, errors = price_sales_exact(product_prices.units, sales_record)
+    return to_money(units, product_prices.scale), errors
+
+
+def merge_breakdowns(labelled_breakdowns):
+    """
+    Add up the breakdowns of several files. Tickets are numbered per
+    store, so their keys become 'label:SALE_ID'.
+    """
+    merged = {name: {} for name in BREAKDOWNS}
+    for label, breakdowns in labelled_breakdowns:
+        for name in BREAKDOWNS:
+            totals = merged[name]
+            for key, amount in breakdowns[name].items():
+                if name == "SALE_ID":
+                    key = f"{label}:{key}"
+                totals[key] = totals.get(key, 0) + amount
+    return merged
+
+
+def compute_total_sales(price_catalogue, sales_record):
+    """Calculate total sales cost."""
+    return price_sales(index_catalogue(price_catalogue), sales_record)
+
+
+def catalogue_table(price_catalogue):
+    """Build the PriceTable (prices and product types) of a catalogue."""
+    return PriceTable(
+        index_catalogue(price_catalogue),
+        {item['title']: item.get('type', '') for item in price_catalogue})
+
+
+def load_product_prices(price_catalogue_file):
+    """
+    Price lookup of a catalogue file: its compiled index (see
+    priceindex.py), rebuilt first when the JSON has changed.
+    """
+    return open_price_index(
+        price_catalogue_file,
+        lambda filename: catalogue_table(load_json_file(filename)))
+
+
+def fuzzy_notes(product_prices):
+    """
+    Lines telling which misspelled names of the last record were matched
+    to the catalogue (--fuzzy), or none without the resolver.
+    """
+    if isinstance(product_prices, FuzzyPrices):
+        return product_prices.notes()
+    return []
+
+
+def init_worker(product_prices):
+    """Keep the catalogue index in a batch worker for all of its files."""
+    global _worker_prices  # pylint: disable=global-statement
+    _worker_prices = product_prices
+
+
+def price_file(filename, stream=False, breakdown=False, money=False):
+    """
+    Price one sales file with the worker's catalogue index. Returns
+    (total or None, errors, breakdowns or None); an unreadable file
+    becomes an error instead of stopping the batch.
+    """
+    if isinstance(_worker_prices, FuzzyPrices):
+        _worker_prices.start_record()
+    try:
+        with open(filename, 'r', encoding='utf-8') as file:
+            sales_record = (iter_json_records(file) if stream
+                            else json.load(file))
+            if breakdown:
+                total, errors, breakdowns = aggregate_sales(
+                    _worker_prices, sales_record, money)
+            else:
+                total, errors = price_record(_worker_prices, sales_record,
+                                             money)
+                breakdowns = None
+        return total, errors + fuzzy_notes(_worker_prices), breakdowns
+    except FileNotFoundError:
+        message = f"Error: File {filename} not found."
+    except json.JSONDecodeError:
+        message = f"Error: File {filename} invalid JSON."
+    except (KeyError, TypeError, ValueError):
+        message = f"Error: File {filename} is not a sales record."
+    return None, [message], None
+
+
+def expand_sales_files(paths, price_catalogue_file):
+    """
+    Expand directories (their .json and .jsonl files) and glob patterns,
+    leaving out the catalogue itself; plain names are kept as given.
+    """
+    catalogue = os.path.abspath(price_catalogue_file)
+    filenames = []
+    for path in paths:
+        if os.path.isdir(path):
+            matches = sorted(glob.glob(os.path.join(path, "*.json"))
+                             + glob.glob(os.path.join(path, "*.jsonl")))
+        elif glob.has_magic(path):
+            matches = sorted(glob.glob(path))
+        else:
+            filenames.append(path)
+            continue
+        filenames.extend(name for name in matches
+                         if os.path.abspath(name) != catalogue)
+    return filenames
+
+
+def compute_batch_sales(product_prices, filenames, workers=None,
+                        stream=False, breakdown=False, money=False):
+    """
+    Price many sales files with one catalogue index, in a pool of worker
+    processes that each receive the index once. Returns a list of
+    (filename, total or None, errors, breakdowns or None) in input order.
+    """
+    arguments = (filenames, repeat(stream), repeat(breakdown), repeat(money))
+    if workers == 1:
+        init_worker(product_prices)
+        results = map(price_file, *arguments)
+        return [(name, *result) for name, result in zip(filenames, results)]
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=(product_prices,)) as executor:
+        results = executor.map(price_file, *arguments)
+        return [(name, *result) for name, result in zip(filenames, results)]
+
+
+def format_report(total_cost, errors, execution_time, breakdowns=None):
+    """
+    Lines of SalesResults.txt: the total, the execution time, the
+    breakdown tables when given, and the errors.
+    """
+    lines = ["Total sales cost: ${:.2f}".format(total_cost),
+             "Execution time: {:.4f} seconds".format(execution_time)]
+    for name, totals in (breakdowns or {}).items():
+        lines.append("")
+        lines.append(f"Sales by {name}:")
+        lines.extend("{}\t{:.2f}".format(key, amount)
+                     for key, amount in totals.items())
     if errors:
-        print("\nErrors:")
-        for error in errors:
-            print(error)
+        lines.append("")
+        lines.append("Errors:")
+        lines.extend(errors)
+    return lines
+
 
+def summarize_batch(results):
+    """
+    Combine the batch results: a per-file TOTAL table like Results.txt,
+    the grand total, the errors and the merged breakdowns (None unless
+    they were computed), each prefixed by its file's label.
+    """
+    table = ["\tTOTAL"]
+    errors = []
+    labelled_breakdowns = []
+    grand_total = 0
+    for filename, total, file_errors, breakdowns in results:
+        label = filename
+        if label.endswith(RECORD_SUFFIX):
+            label = label[:-len(RECORD_SUFFIX)]
+        if total is None:
+            table.append(f"{label}\tERROR")
+        else:
+            table.append("{}\t{:.2f}".format(label, total))
+            grand_total += total
+        errors.extend(f"{label}: {error}" for error in file_errors)
+        if breakdowns is not None:
+            labelled_breakdowns.append((label, breakdowns))
+
+    merged = (merge_breakdowns(labelled_breakdowns)
+              if labelled_breakdowns else None)
+    return table, grand_total, errors, merged
+
+
+def save_breakdowns(breakdowns, total_cost, output_format):
+    """
+    Write the breakdowns to SalesResults.csv (breakdown, key, total rows)
+    or SalesResults.json ({breakdown: {key: total}} plus the total).
+    """
+    if output_format == "csv":
+        with open("SalesResults.csv", "w", encoding='utf-8',
+                  newline='') as results_file:
+            writer = csv.writer(results_file)
+            writer.writerow(["breakdown", "key", "total"])
+            for name, totals in breakdowns.items():
+                writer.writerows(
+                    (name, key, "{:.2f}".format(amount))
+                    for key, amount in totals.items())
+            writer.writerow(["TOTAL", "", "{:.2f}".format(total_cost)])
+    else:
+        document = {name: {str(key): float(round(amount, 2))
+                           for key, amount in totals.items()}
+                    for name, totals in breakdowns.items()}
+        document["TOTAL"] = float(round(total_cost, 2))
+        with open("SalesResults.json", "w",
+                  encoding='utf-8') as results_file:
+            json.dump(document, results_file, indent=2)
+            results_file.write("\n")
+
+
+def write_results(lines, breakdowns, total_cost, output_format):
+    """
+    Print the report and save it to SalesResults.txt. Breakdowns go into
+    the report for 'txt' and into their own file for 'csv' or 'json'.
+    """
+    print("\n".join(lines))
     with open("SalesResults.txt", "w", encoding='utf-8') as results_file:
-        results_file.write("Total sales cost: ${:.2f}\n".format(total_cost))
-        results_file.write(
-            "Execution time: {:.4f} seconds\n".format(execution_time)
-        )
-        if errors:
-            results_file.write("\nErrors:\n")
-            for error in errors:
-                results_file.write(error + "\n")
+        results_file.write("\n".join(lines) + "\n")
+    if breakdowns is not None and output_format != "txt":
+        save_breakdowns(breakdowns, total_cost, output_format)
+
+
+def load_catalogue(args):
+    """
+    Load the catalogue lookup, checking that --money can price it exactly,
+    and put the --fuzzy resolver in front of it when asked for.
+    """
+    product_prices = load_product_prices(args.price_catalogue_file)
+    if args.money and getattr(product_prices, 'units', None) is None:
+        print(f"Error: File {args.price_catalogue_file} has prices that "
+              f"are not finite numbers.")
+        sys.exit(1)
+    if args.fuzzy:
+        product_prices = FuzzyPrices(product_prices,
+                                     TrigramIndex(product_prices),
+                                     args.fuzzy == "apply",
+                                     args.fuzzy_threshold)
+    return product_prices
+
+
+def run_batch(args, filenames):
+    """Price every sales file against one catalogue and save the report."""
+    start_time = time.time()
+
+    product_prices = load_catalogue(args)
+    results = compute_batch_sales(product_prices, filenames, args.workers,
+                                  args.stream, args.breakdown is not None,
+                                  args.money)
+
+    execution_time = time.time() - start_time
+
+    table, grand_total, errors, breakdowns = summarize_batch(results)
+    lines = table + format_report(
+        grand_total, errors, execution_time,
+        breakdowns if args.breakdown == "txt" else None)
+    write_results(lines, breakdowns, grand_total, args.breakdown)
+
+
+def parse_arguments():
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(
+        prog="computeSales.py",
+        description="Computes the total cost of a sales record.")
+    parser.add_argument("price_catalogue_file")
+    parser.add_argument(
+        "sales_record_files", nargs="+", metavar="sales_record_file",
+        help="sales record; several files, glob patterns or directories "
+             "are priced as a batch with per-file totals and a grand total")
+    parser.add_argument(
+        "--stream", action="store_true",
+        help="read the sales record one sale at a time instead of loading "
+             "it whole; also accepts JSON Lines (one sale per line)")
+    parser.add_argument(
+        "--workers", type=int, default=None,
+        help="processes pricing files in batch mode (default: one per CPU)")
+    parser.add_argument(
+        "--breakdown", nargs="?", const="txt", choices=("txt", "csv", "json"),
+        help="also total the sales per SALE_ID, SALE_Date and product type, "
+             "in SalesResults.txt or in SalesResults.csv / .json")
+    parser.add_argument(
+        "--money", action="store_true",
+        help="add up exact prices in integer cents instead of floats, so "
+             "totals match the ledger to the cent")
+    parser.add_argument(
+        "--fuzzy", choices=("suggest", "apply"),
+        help="match unknown product names to the closest catalogue title: "
+             "suggest it next to the error, or apply it and price the sale")
+    parser.add_argument(
+        "--fuzzy-threshold", type=float, default=DEFAULT_THRESHOLD,
+        help="trigram similarity from 0 to 1 a match needs "
+             "(default: %(default)s)")
+    args = parser.parse_args()
+    if not 0 < args.fuzzy_threshold <= 1:
+        parser.error("--fuzzy-threshold must be above 0 and at most 1")
+    return args
+
+
+def main():
+    """Main function to execute."""
+    args = parse_arguments()
+    filenames = expand_sales_files(args.sales_record_files,
+                                   args.price_catalogue_file)
+    if len(args.sales_record_files) > 1 or (
+            filenames != args.sales_record_files):
+        run_batch(args, filenames)
+        return
+
+    start_time = time.time()
+
+    product_prices = load_catalogue(args)
+    if args.stream:
+        sales_record = iter_json_file(filenames[0])
+    else:
+        sales_record = load_json_file(filenames[0])
+
+    breakdowns = None
+    if args.breakdown:
+        total_cost, errors, breakdowns = aggregate_sales(
+            product_prices, sales_record, args.money)
+    else:
+        total_cost, errors = price_record(product_prices, sales_record,
+                                          args.money)
+    errors += fuzzy_notes(product_prices)
+
+    execution_time = time.time() - start_time
+
+    lines = format_report(total_cost, errors, execution_time,
+                          breakdowns if args.breakdown == "txt" else None)
+    write_results(lines, breakdowns, total_cost, args.breakdown)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,161 @@
+"""
+Fuzzy product-name resolution for computeSales.py --fuzzy.
+
+TrigramIndex is built once over the catalogue titles: every title is cut
+into overlapping three-character pieces and each piece points to the
+titles that contain it. An unknown name is scored against only the titles
+sharing a piece with it (Dice coefficient of the trigram sets), so the
+cost per name depends on how many titles look alike, not on the
+catalogue size. FuzzyPrices wraps a price lookup so the pricing loops of
+computeSales.py use the resolver without changes, and resolves every
+distinct bad name once.
+"""
+# Dice similarity needed to accept a match
+DEFAULT_THRESHOLD = 0.6
+
+
+def normalize(name):
+    """Case-folded name with runs of whitespace collapsed."""
+    return " ".join(name.casefold().split())
+
+
+def trigrams(name):
+    """Distinct trigrams of a normalized name, padded so short names and
+    word starts count too."""
+    padded = f"  {normalize(name)} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """Inverted trigram index over catalogue titles."""
+
+    def __init__(self, titles):
+        self.titles = []
+        self.postings = {}
+        for title in titles:
+            if not isinstance(title, str):
+                continue
+            position = len(self.titles)
+            self.titles.append(title)
+            for gram in trigrams(title):
+                self.postings.setdefault(gram, []).append(position)
+
+    def best_match(self, name, threshold=DEFAULT_THRESHOLD):
+        """
+        (title, similarity) of the closest title, or None when no title
+        reaches threshold. Ties go to the title listed first.
+
+        Trigrams are visited rarest first and every new title is scored
+        exactly when it first shows up. A title not met yet can only share
+        the trigrams still unvisited, so the search stops as soon as that
+        bound falls below the best score, usually long before the common
+        trigrams whose lists cover most of the catalogue.
+        """
+        if not isinstance(name, str):
+            return None
+        grams = trigrams(name)
+        size = len(grams)
+        order = sorted(grams,
+                       key=lambda gram: len(self.postings.get(gram, ())))
+
+        best = None
+        best_score = threshold
+        seen = set()
+        for visited, gram in enumerate(order):
+            remaining = size - visited
+            if 2 * remaining / (size + remaining) < best_score:
+                break
+            for position in self.postings.get(gram, ()):
+                if position in seen:
+                    continue
+                seen.add(position)
+                title_grams = trigrams(self.titles[position])
+                score = (2 * len(grams & title_grams)
+                         / (size + len(title_grams)))
+                if score > best_score or (score == best_score and (
+                        best is None or position < best)):
+                    best, best_score = position, score
+        if best is None:
+            return None
+        return self.titles[best], best_score
+
+
+class FuzzyPrices:
+    """
+    Price lookup that resolves unknown titles through a TrigramIndex.
+    With apply, a close match is priced as that catalogue product; without
+    it the name stays unknown and the match is only suggested. Matches
+    are cached for the whole run; notes() lists the ones used by the
+    current sales record.
+    """
+
+    def __init__(self, product_prices, index, apply=False,
+                 threshold=DEFAULT_THRESHOLD, _shared=None):
+        self.prices = product_prices
+        self.index = index
+        self.apply = apply
+        self.threshold = threshold
+        # {bad name: match or None} and the names met in this record
+        self.cache, self.used = _shared if _shared else ({}, {})
+
+    @property
+    def units(self):
+        """Exact-money view with the same resolutions."""
+        return FuzzyPrices(self.prices.units, self.index, self.apply,
+                           self.threshold, (self.cache, self.used))
+
+    @property
+    def scale(self):
+        """Money scale of the wrapped lookup."""
+        return self.prices.scale
+
+    def resolve(self, name):
+        """Closest catalogue title of an unknown name, or None."""
+        try:
+            match = self.cache[name]
+        except KeyError:
+            match = self.cache[name] = self.index.best_match(
+                name, self.threshold)
+        self.used[name] = match
+        return match
+
+    def __contains__(self, name):
+        if name in self.prices:
+            return True
+        return self.resolve(name) is not None and self.apply
+
+    def __getitem__(self, name):
+        try:
+            return self.prices[name]
+        except KeyError:
+            match = self.resolve(name)
+            if match is None or not self.apply:
+                raise
+            return self.prices[match[0]]
+
+    def type_of(self, name):
+        """Product type, following an applied match."""
+        if name not in self.prices and self.apply:
+            match = self.resolve(name)
+            if match is not None:
+                name = match[0]
+        return self.prices.type_of(name)
+
+    def start_record(self):
+        """Forget which names the previous sales record used."""
+        self.used.clear()
+
+    def notes(self):
+        """One line per misspelled name of the record that has a match."""
+        lines = []
+        for name, match in self.used.items():
+            if match is None:
+                continue
+            title, score = match
+            if self.apply:
+                lines.append(f"'{name}' priced as '{title}' "
+                             f"(similarity {score:.2f}).")
+            else:
+                lines.append(f"'{name}': did you mean '{title}'? "
+                             f"(similarity {score:.2f})")
+        return lines
@@ -0,0 +1,397 @@
+"""
+Compiled price index for computeSales.py.
+
+priceCatalogue.json carries descriptions, image names and sizes that
+pricing never uses, and parsing it costs time proportional to its size on
+every run. compile_index() keeps only titles, prices and product types in
+a binary file next to the catalogue:
+
+    header        magic, version, byte order, source mtime and size,
+                  counts, money scale
+    slots         uint32 open-addressing table (entry + 1, 0 = empty),
+                  keyed on the crc32 of the UTF-8 title
+    prices        float64 per entry
+    units         int64 per entry, the exact price times the money scale
+    offsets       uint32 per entry, start of the title in the blob
+    lengths       uint32 per entry, length of the title in the blob
+    hashes        uint32 per entry, crc32 of the title
+    type ids      uint32 per entry, position in the type table
+    type offsets  uint32 per distinct type, start of its name in the blob
+    type lengths  uint32 per distinct type, length of its name
+    blob          UTF-8 titles and type names
+
+PriceIndex memory-maps that file, so opening it costs the same whatever
+the catalogue size, and the index is rebuilt whenever the catalogue's
+mtime or size no longer match the header.
+
+Usage: python priceindex.py priceCatalogue.json
+"""
+import json
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from collections.abc import Mapping
+from decimal import Decimal
+
+MAGIC = b'PIDX'
+VERSION = 3
+BYTE_ORDER = {'little': 0, 'big': 1}[sys.byteorder]
+
+# magic, version, byte order, source mtime (ns), source size, entries,
+# slots, distinct types, blob size, money scale
+HEADER = struct.Struct('<4sHBxqqIIIIq')
+
+# Prices are converted to whole cents, or to a finer power of ten when a
+# catalogue has prices with more than two decimals
+MIN_SCALE = 100
+
+# Slots per entry; the table stays at most half full
+LOAD_FACTOR = 2
+MIN_SLOTS = 8
+
+
+def index_path(catalogue_file):
+    """Path of the compiled index that belongs to a catalogue."""
+    return os.path.splitext(catalogue_file)[0] + '.idx'
+
+
+def encode_title(title):
+    """UTF-8 bytes of a title, keeping lone surrogates from JSON escapes."""
+    return title.encode('utf-8', 'surrogatepass')
+
+
+def money_scale(prices):
+    """
+    Smallest power of ten, at least MIN_SCALE, that turns every price into
+    a whole number. Prices are read as the decimal they were written as
+    (28.1 is 28.1, not the nearest binary float). Raises ArithmeticError,
+    TypeError or ValueError for values that are not finite numbers.
+    """
+    digits = 0
+    for price in prices:
+        if isinstance(price, bool):
+            raise TypeError(f"not a price: {price!r}")
+        digits = max(digits, -Decimal(repr(price)).as_tuple().exponent)
+    return max(MIN_SCALE, 10 ** digits)
+
+
+def to_units(price, scale):
+    """Exact price times scale, as an int."""
+    return int(Decimal(repr(price)) * scale)
+
+
+class PriceTable(dict):
+    """
+    {title: price} dict that also knows each product's type; the lookup
+    computeSales uses when a catalogue has no compiled index.
+    """
+
+    def __init__(self, product_prices=(), product_types=None):
+        super().__init__(product_prices)
+        self.types = dict(product_types or {})
+
+        # Exact prices for money mode, converted once; None when some
+        # price is not a finite number
+        try:
+            self.scale = money_scale(self.values())
+            self.units = {title: to_units(price, self.scale)
+                          for title, price in self.items()}
+        except (ArithmeticError, TypeError, ValueError):
+            self.scale = self.units = None
+
+    def type_of(self, title):
+        """Type of a catalogue product ('' when it has none)."""
+        return self.types.get(title, '')
+
+
+def compile_index(product_prices, index_file, source_stat):
+    """
+    Write a PriceTable as a binary index stamped with the catalogue's
+    stat. Raises TypeError when a title or type is not a string or a price
+    is not a finite number, since those cannot be packed without changing
+    how computeSales prices them, and OverflowError when an exact price
+    does not fit in int64.
+    """
+    if product_prices.units is None:
+        raise TypeError("prices are not all finite numbers")
+    count = len(product_prices)
+    slot_count = MIN_SLOTS
+    while slot_count < count * LOAD_FACTOR:
+        slot_count *= 2
+    mask = slot_count - 1
+
+    slots = array('I', bytes(4 * slot_count))
+    prices = array('d')
+    units = array('q')
+    offsets = array('I')
+    lengths = array('I')
+    hashes = array('I')
+    type_ids = array('I')
+    type_offsets = array('I')
+    type_lengths = array('I')
+    type_positions = {}
+    blob = bytearray()
+
+    for entry, (title, price) in enumerate(product_prices.items()):
+        product_type = product_prices.type_of(title)
+        if not isinstance(title, str) or isinstance(price, bool) \
+                or not isinstance(price, (int, float)) \
+                or not isinstance(product_type, str):
+            raise TypeError(f"cannot index {title!r}: {price!r}")
+        data = encode_title(title)
+        code = zlib.crc32(data)
+
+        slot = code & mask
+        while slots[slot]:
+            slot = (slot + 1) & mask
+        slots[slot] = entry + 1
+
+        prices.append(price)
+        units.append(product_prices.units[title])
+        offsets.append(len(blob))
+        lengths.append(len(data))
+        hashes.append(code)
+        blob += data
+
+        if product_type not in type_positions:
+            type_positions[product_type] = len(type_positions)
+            name = encode_title(product_type)
+            type_offsets.append(len(blob))
+            type_lengths.append(len(name))
+            blob += name
+        type_ids.append(type_positions[product_type])
+
+    header = HEADER.pack(MAGIC, VERSION, BYTE_ORDER,
+                         source_stat.st_mtime_ns, source_stat.st_size,
+                         count, slot_count, len(type_positions), len(blob),
+                         product_prices.scale)
+
+    # Written aside and renamed, so a reader never maps a partial index
+    temp_file = index_file + '.tmp'
+    with open(temp_file, 'wb') as file:
+        file.write(header)
+        for section in (slots, prices, units, offsets, lengths, hashes,
+                        type_ids, type_offsets, type_lengths):
+            section.tofile(file)
+        file.write(blob)
+    os.replace(temp_file, index_file)
+
+
+class PriceIndex(Mapping):
+    """
+    Read-only {title: price} mapping over a memory-mapped index. Each
+    title is resolved through the hash table once and its entry cached, so
+    lookups, membership, len(), iteration and the keys/values/items views
+    all see the whole catalogue. Pricing loops keep their own plain dict
+    of the titles they meet, which answers repeated sales at C speed.
+    """
+
+    def __init__(self, path, view):
+        self.path = path
+        (_, _, _, _, _, self._count, slot_count,
+         type_count, blob_size, self.scale) = HEADER.unpack_from(view)
+        self._mask = slot_count - 1
+
+        memory = memoryview(view)
+        position = HEADER.size
+
+        def section(length, code):
+            nonlocal position
+            part = memory[position:position + length]
+            position += length
+            return part.cast(code) if code != 'B' else part
+
+        self._slots = section(4 * slot_count, 'I')
+        self._prices = section(8 * self._count, 'd')
+        self._units = section(8 * self._count, 'q')
+        self._offsets = section(4 * self._count, 'I')
+        self._lengths = section(4 * self._count, 'I')
+        self._hashes = section(4 * self._count, 'I')
+        self._type_ids = section(4 * self._count, 'I')
+        type_offsets = section(4 * type_count, 'I')
+        type_lengths = section(4 * type_count, 'I')
+        self._blob = section(blob_size, 'B')
+        self._entries = {}
+        self.units = UnitsView(self._lookup, self._units, self)
+
+        # The few distinct type names are decoded once
+        self._types = [
+            bytes(self._blob[start:start + length]).decode(
+                'utf-8', 'surrogatepass')
+            for start, length in zip(type_offsets, type_lengths)]
+
+    @classmethod
+    def open(cls, index_file, source_stat=None):
+        """
+        Map an index file. Returns None when it is missing, damaged, built
+        for another byte order, or older than source_stat.
+        """
+        try:
+            with open(index_file, 'rb') as file:
+                view = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+
+        try:
+            (magic, version, byte_order, mtime_ns, size, count, slot_count,
+             type_count, blob_size, _) = HEADER.unpack_from(view)
+        except struct.error:
+            return None
+        expected_size = (HEADER.size + 4 * slot_count + 32 * count
+                         + 8 * type_count + blob_size)
+        if (magic != MAGIC or version != VERSION
+                or byte_order != BYTE_ORDER or len(view) != expected_size
+                or slot_count & (slot_count - 1) or slot_count <= count):
+            return None
+        if source_stat is not None and (
+                mtime_ns != source_stat.st_mtime_ns
+                or size != source_stat.st_size):
+            return None
+        return cls(index_file, view)
+
+    def __reduce__(self):
+        # Batch workers map the same file again instead of copying it
+        return _reopen, (self.path,)
+
+    def _entry(self, title):
+        """Entry of a title in the hash table, or -1."""
+        if not isinstance(title, str):
+            return -1
+        data = encode_title(title)
+        code = zlib.crc32(data)
+        slot = code & self._mask
+        while True:
+            entry = self._slots[slot] - 1
+            if entry < 0:
+                return entry
+            start = self._offsets[entry]
+            if (self._hashes[entry] == code
+                    and self._blob[start:start + self._lengths[entry]]
+                    == data):
+                return entry
+            slot = (slot + 1) & self._mask
+
+    def _lookup(self, title):
+        """Entry of a title (-1 when absent), resolved once."""
+        try:
+            return self._entries[title]
+        except KeyError:
+            entry = self._entries[title] = self._entry(title)
+            return entry
+
+    def __getitem__(self, title):
+        entry = self._lookup(title)
+        if entry < 0:
+            raise KeyError(title)
+        return self._prices[entry]
+
+    def __contains__(self, title):
+        return self._lookup(title) >= 0
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        for start, length in zip(self._offsets, self._lengths):
+            yield bytes(self._blob[start:start + length]).decode(
+                'utf-8', 'surrogatepass')
+
+    def type_of(self, title):
+        """Type of a catalogue product ('' when it has none)."""
+        entry = self._lookup(title)
+        return '' if entry < 0 else self._types[self._type_ids[entry]]
+
+
+class UnitsView(Mapping):
+    """
+    {title: exact price in units of 1 / scale} view of a PriceIndex,
+    sharing its cached title lookups and its titles.
+    """
+
+    def __init__(self, lookup, units, titles):
+        self._lookup = lookup
+        self._units = units
+        self._titles = titles
+
+    def __getitem__(self, title):
+        entry = self._lookup(title)
+        if entry < 0:
+            raise KeyError(title)
+        return self._units[entry]
+
+    def __contains__(self, title):
+        return self._lookup(title) >= 0
+
+    def __len__(self):
+        return len(self._titles)
+
+    def __iter__(self):
+        return iter(self._titles)
+
+
+def _reopen(path):
+    """Unpickle a PriceIndex by mapping its file again."""
+    return PriceIndex.open(path)
+
+
+def open_price_index(catalogue_file, build_prices):
+    """
+    Return the price lookup of a catalogue: its compiled index when that
+    is up to date, otherwise the PriceTable from
+    build_prices(catalogue_file), compiled for the next run. The table
+    itself is returned when it cannot be compiled or saved.
+    """
+    try:
+        source_stat = os.stat(catalogue_file)
+    except OSError:
+        # Let build_prices report the missing catalogue
+        return build_prices(catalogue_file)
+
+    index_file = index_path(catalogue_file)
+    index = PriceIndex.open(index_file, source_stat)
+    if index is not None:
+        return index
+
+    product_prices = build_prices(catalogue_file)
+    try:
+        compile_index(product_prices, index_file, source_stat)
+    except (OSError, OverflowError, TypeError):
+        return product_prices
+    return PriceIndex.open(index_file, source_stat) or product_prices
+
+
+def main():
+    """Compile the catalogue given on the command line."""
+    if len(sys.argv) != 2:
+        print("Usage: python priceindex.py priceCatalogue.json")
+        sys.exit(1)
+
+    catalogue_file = sys.argv[1]
+    try:
+        source_stat = os.stat(catalogue_file)
+        with open(catalogue_file, 'r', encoding='utf-8') as file:
+            catalogue = json.load(file)
+        product_prices = PriceTable(
+            {item['title']: item['price'] for item in catalogue},
+            {item['title']: item.get('type', '') for item in catalogue})
+        compile_index(product_prices, index_path(catalogue_file),
+                      source_stat)
+    except FileNotFoundError:
+        print(f"Error: File {catalogue_file} not found.")
+        sys.exit(1)
+    except json.JSONDecodeError:
+        print(f"Error: File {catalogue_file} invalid JSON.")
+        sys.exit(1)
+    except (OverflowError, TypeError) as error:
+        print(f"Error: {error}")
+        sys.exit(1)
+
+    print(f"Compiled {len(product_prices)} prices into "
+          f"{index_path(catalogue_file)}")
+
+
+if __name__ == "__main__":
+    main()
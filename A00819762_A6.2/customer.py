@@ -3,8 +3,9 @@ customer.py
 
 """
 
-import json
-import os
+import sqlite3
+
+from storage import get_connection
 
 
 class Customer:
@@ -47,85 +48,74 @@ class Customer:
 
 class CustomerManager:
     """
-    Maneja (CRUD) los clientes y su persistencia en TCcustomer.json.
+    Maneja (CRUD) los clientes, guardados en la tabla customers de
+    storage.py.
     """
 
-    FILE_PATH = "TCcustomer.json"
-
     @staticmethod
-    def load_customers():
+    def from_row(row):
         """
-        Carga clientes de TCcustomer.json.
-        Retorna un dict {customer_id: Customer}.
+        Construye un Customer a partir de una fila de la tabla customers.
         """
-        if not os.path.exists(CustomerManager.FILE_PATH):
-            return {}
-
-        try:
-            with open(CustomerManager.FILE_PATH, "r", encoding="utf-8") as file:
-                data = json.load(file)
-            customers = {}
-            for c_id, c_data in data.items():
-                customer = Customer(
-                    customer_id=c_data["customer_id"],
-                    name=c_data["name"],
-                    email=c_data["email"]
-                )
-                customers[c_id] = customer
-            return customers
-        except (json.JSONDecodeError, KeyError, TypeError) as error:
-            print(f"[Error] Datos de cliente inválidos: {error}")
-            return {}
+        return Customer(row["customer_id"], row["name"], row["email"])
 
     @staticmethod
-    def save_customers(customers):
+    def get_customer(customer_id):
         """
-        Guarda en TCcustomer.json los datos de {customer_id: Customer}.
+        Busca un cliente por su ID. Retorna el Customer o None.
         """
-        data = {}
-        for c_id, cust in customers.items():
-            data[c_id] = {
-                "customer_id": cust.customer_id,
-                "name": cust.name,
-                "email": cust.email
-            }
-        with open(CustomerManager.FILE_PATH, "w", encoding="utf-8") as file:
-            json.dump(data, file, indent=2)
+        row = get_connection().execute(
+            "SELECT * FROM customers WHERE customer_id = ?", (customer_id,)
+        ).fetchone()
+        return CustomerManager.from_row(row) if row else None
 
     @staticmethod
     def create_customer(customer_id, name, email):
-        customers = CustomerManager.load_customers()
-        if customer_id in customers:
+        connection = get_connection()
+        try:
+            with connection:
+                connection.execute(
+                    "INSERT INTO customers (customer_id, name, email) "
+                    "VALUES (?, ?, ?)",
+                    (customer_id, name, email)
+                )
+        except sqlite3.IntegrityError:
             print(f"Cliente con ID '{customer_id}' ya existe.")
             return False
-        customers[customer_id] = Customer(customer_id, name, email)
-        CustomerManager.save_customers(customers)
         return True
 
     @staticmethod
     def delete_customer(customer_id):
-        customers = CustomerManager.load_customers()
-        if customer_id not in customers:
+        connection = get_connection()
+        with connection:
+            cursor = connection.execute(
+                "DELETE FROM customers WHERE customer_id = ?", (customer_id,)
+            )
+        if cursor.rowcount == 0:
             print(f"No se encontró cliente con ID '{customer_id}'.")
             return False
-        del customers[customer_id]
-        CustomerManager.save_customers(customers)
         return True
 
     @staticmethod
     def display_customer_info(customer_id):
-        customers = CustomerManager.load_customers()
-        if customer_id not in customers:
+        customer = CustomerManager.get_customer(customer_id)
+        if customer is None:
             print(f"No se encontró cliente con ID '{customer_id}'.")
             return ""
-        return customers[customer_id].display_customer_info()
+        return customer.display_customer_info()
 
     @staticmethod
     def modify_customer_info(customer_id, **kwargs):
-        customers = CustomerManager.load_customers()
-        if customer_id not in customers:
+        customer = CustomerManager.get_customer(customer_id)
+        if customer is None:
             print(f"No se encontró cliente con ID '{customer_id}'.")
             return False
-        customers[customer_id].modify_customer_info(**kwargs)
-        CustomerManager.save_customers(customers)
+        customer.modify_customer_info(**kwargs)
+        connection = get_connection()
+        with connection:
+            connection.execute(
+                "UPDATE customers SET name = ?, email = ? "
+                "WHERE customer_id = ?",
+                (customer.name, customer.email, customer_id)
+            )
         return True
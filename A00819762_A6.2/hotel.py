@@ -3,8 +3,9 @@ hotel.py
 
 """
 
-import json
-import os
+import sqlite3
+
+from storage import get_connection
 
 
 class Hotel:
@@ -62,6 +63,8 @@ class Hotel:
         """
         Reserva una habitación si hay disponibilidad.
         Retorna True si se pudo reservar, False si no había cupo.
+        Solo cambia este objeto: HotelManager.reserve_room aplica la misma
+        regla con un UPDATE en la base de datos.
         """
         if self.available_rooms() > 0:
             self.reserved_rooms += 1
@@ -72,6 +75,8 @@ class Hotel:
         """
         Cancela una reserva de habitación (si existe al menos una reservada).
         Retorna True si se pudo cancelar, False si no había reservas.
+        Solo cambia este objeto: HotelManager.cancel_reservation aplica la
+        misma regla con un UPDATE en la base de datos.
         """
         if self.reserved_rooms > 0:
             self.reserved_rooms -= 1
@@ -81,109 +86,114 @@ class Hotel:
 
 class HotelManager:
     """
-    Clase que maneja (CRUD) los hoteles y su persistencia en TChotel.json.
+    Clase que maneja (CRUD) los hoteles, guardados en la tabla hotels de
+    storage.py.
     """
 
-    FILE_PATH = "TChotel.json"
-
     @staticmethod
-    def load_hotels():
+    def from_row(row):
         """
-        Carga los hoteles desde TChotel.json.
-        Retorna un diccionario {hotel_id: Hotel}.
+        Construye un Hotel a partir de una fila de la tabla hotels.
         """
-        if not os.path.exists(HotelManager.FILE_PATH):
-            return {}
-
-        try:
-            with open(HotelManager.FILE_PATH, "r", encoding="utf-8") as file:
-                data = json.load(file)
-            hotels = {}
-            for h_id, h_data in data.items():
-                hotel = Hotel(
-                    hotel_id=h_data["hotel_id"],
-                    name=h_data["name"],
-                    location=h_data["location"],
-                    total_rooms=h_data["total_rooms"]
-                )
-                hotel.reserved_rooms = h_data["reserved_rooms"]
-                hotels[h_id] = hotel
-            return hotels
-        except (json.JSONDecodeError, KeyError, TypeError) as error:
-            print(f"[Error] Datos de hotel inválidos: {error}")
-            return {}
+        hotel = Hotel(row["hotel_id"], row["name"], row["location"],
+                      row["total_rooms"])
+        hotel.reserved_rooms = row["reserved_rooms"]
+        return hotel
 
     @staticmethod
-    def save_hotels(hotels):
-        """
-        Guarda en TChotel.json los datos de un dict {hotel_id: Hotel}.
-        """
-        data = {}
-        for h_id, hotel in hotels.items():
-            data[h_id] = {
-                "hotel_id": hotel.hotel_id,
-                "name": hotel.name,
-                "location": hotel.location,
-                "total_rooms": hotel.total_rooms,
-                "reserved_rooms": hotel.reserved_rooms
-            }
-        with open(HotelManager.FILE_PATH, "w", encoding="utf-8") as file:
-            json.dump(data, file, indent=2)
+    def get_hotel(hotel_id):
+        """
+        Busca un hotel por su ID. Retorna el Hotel o None.
+        """
+        row = get_connection().execute(
+            "SELECT * FROM hotels WHERE hotel_id = ?", (hotel_id,)
+        ).fetchone()
+        return HotelManager.from_row(row) if row else None
 
     @staticmethod
     def create_hotel(hotel_id, name, location, total_rooms):
-        hotels = HotelManager.load_hotels()
-        if hotel_id in hotels:
+        connection = get_connection()
+        try:
+            with connection:
+                connection.execute(
+                    "INSERT INTO hotels (hotel_id, name, location, "
+                    "total_rooms) VALUES (?, ?, ?, ?)",
+                    (hotel_id, name, location, total_rooms)
+                )
+        except sqlite3.IntegrityError:
             print(f"Hotel con ID '{hotel_id}' ya existe.")
             return False
-        hotels[hotel_id] = Hotel(hotel_id, name, location, total_rooms)
-        HotelManager.save_hotels(hotels)
         return True
 
     @staticmethod
     def delete_hotel(hotel_id):
-        hotels = HotelManager.load_hotels()
-        if hotel_id not in hotels:
+        connection = get_connection()
+        with connection:
+            cursor = connection.execute(
+                "DELETE FROM hotels WHERE hotel_id = ?", (hotel_id,)
+            )
+        if cursor.rowcount == 0:
             print(f"No se encontró hotel con ID '{hotel_id}'.")
             return False
-        del hotels[hotel_id]
-        HotelManager.save_hotels(hotels)
         return True
 
     @staticmethod
     def display_hotel_info(hotel_id):
-        hotels = HotelManager.load_hotels()
-        if hotel_id not in hotels:
+        hotel = HotelManager.get_hotel(hotel_id)
+        if hotel is None:
             print(f"No se encontró hotel con ID '{hotel_id}'.")
             return ""
-        return hotels[hotel_id].display_hotel_info()
+        return hotel.display_hotel_info()
 
     @staticmethod
     def modify_hotel_info(hotel_id, **kwargs):
-        hotels = HotelManager.load_hotels()
-        if hotel_id not in hotels:
+        hotel = HotelManager.get_hotel(hotel_id)
+        if hotel is None:
             print(f"No se encontró hotel con ID '{hotel_id}'.")
             return False
-        hotels[hotel_id].modify_hotel_info(**kwargs)
-        HotelManager.save_hotels(hotels)
+        hotel.modify_hotel_info(**kwargs)
+        connection = get_connection()
+        with connection:
+            connection.execute(
+                "UPDATE hotels SET name = ?, location = ?, total_rooms = ? "
+                "WHERE hotel_id = ?",
+                (hotel.name, hotel.location, hotel.total_rooms, hotel_id)
+            )
         return True
 
     @staticmethod
     def reserve_room(hotel_id):
-        hotels = HotelManager.load_hotels()
-        if hotel_id not in hotels:
-            print(f"No se encontró hotel con ID '{hotel_id}'.")
+        """
+        Reserva una habitación con un solo UPDATE, que solo procede si
+        quedan habitaciones disponibles.
+        """
+        connection = get_connection()
+        with connection:
+            cursor = connection.execute(
+                "UPDATE hotels SET reserved_rooms = reserved_rooms + 1 "
+                "WHERE hotel_id = ? AND reserved_rooms < total_rooms",
+                (hotel_id,)
+            )
+        if cursor.rowcount == 0:
+            if HotelManager.get_hotel(hotel_id) is None:
+                print(f"No se encontró hotel con ID '{hotel_id}'.")
             return False
-        success = hotels[hotel_id].reserve_room()
-        HotelManager.save_hotels(hotels)
-        return success
+        return True
 
     @staticmethod
     def cancel_reservation(hotel_id):
-        hotels = HotelManager.load_hotels()
-        if hotel_id not in hotels:
-            print(f"No se encontró hotel con ID '{hotel_id}'.")
+        """
+        Libera una habitación si el hotel tiene alguna reservada.
+        """
+        connection = get_connection()
+        with connection:
+            cursor = connection.execute(
+                "UPDATE hotels SET reserved_rooms = reserved_rooms - 1 "
+                "WHERE hotel_id = ? AND reserved_rooms > 0",
+                (hotel_id,)
+            )
+        if cursor.rowcount == 0:
+            if HotelManager.get_hotel(hotel_id) is None:
+                print(f"No se encontró hotel con ID '{hotel_id}'.")
             return False
-        success = hotels[hotel_id].cancel_reservation()
-        HotelManager.save_hotels(hotels)
-        return success
+        return True
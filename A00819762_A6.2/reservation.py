@@ -2,15 +2,15 @@
 reservation.py
 
 Define la clase Reservation y ReservationManager.
-Usa TCreservation.json para almacenar la información de reservas.
+Las reservas se guardan en la tabla reservations de storage.py.
 """
 
-import json
-import os
+import sqlite3
 from datetime import datetime
 
 from hotel import HotelManager
 from customer import CustomerManager
+from storage import get_connection
 
 
 class Reservation:
@@ -47,109 +47,98 @@ class Reservation:
 
 class ReservationManager:
     """
-    Maneja (CRUD) las reservas y su persistencia en TCreservation.json.
+    Maneja (CRUD) las reservas, guardadas en la tabla reservations de
+    storage.py.
     """
 
-    FILE_PATH = "TCreservation.json"
-
     @staticmethod
-    def load_reservations():
+    def from_row(row):
         """
-        Carga las reservas de TCreservation.json.
-        Retorna {reservation_id: Reservation}.
+        Construye una Reservation a partir de una fila de la tabla
+        reservations.
         """
-        if not os.path.exists(ReservationManager.FILE_PATH):
-            return {}
-
-        try:
-            with open(ReservationManager.FILE_PATH, "r", encoding="utf-8") as file:
-                data = json.load(file)
-            reservations = {}
-            for r_id, r_data in data.items():
-                reservation = Reservation(
-                    reservation_id=r_data["reservation_id"],
-                    hotel_id=r_data["hotel_id"],
-                    customer_id=r_data["customer_id"],
-                    date_str=r_data["date_str"]
-                )
-                reservations[r_id] = reservation
-            return reservations
-        except (json.JSONDecodeError, KeyError, TypeError) as error:
-            print(f"[Error] Datos de reserva inválidos: {error}")
-            return {}
+        return Reservation(row["reservation_id"], row["hotel_id"],
+                           row["customer_id"], row["date_str"])
 
     @staticmethod
-    def save_reservations(reservations):
+    def get_reservation(reservation_id):
         """
-        Guarda en TCreservation.json.
+        Busca una reserva por su ID. Retorna la Reservation o None.
         """
-        data = {}
-        for r_id, reservation in reservations.items():
-            data[r_id] = {
-                "reservation_id": reservation.reservation_id,
-                "hotel_id": reservation.hotel_id,
-                "customer_id": reservation.customer_id,
-                "date_str": reservation.date_str
-            }
-        with open(ReservationManager.FILE_PATH, "w", encoding="utf-8") as file:
-            json.dump(data, file, indent=2)
+        row = get_connection().execute(
+            "SELECT * FROM reservations WHERE reservation_id = ?",
+            (reservation_id,)
+        ).fetchone()
+        return ReservationManager.from_row(row) if row else None
 
     @staticmethod
     def create_reservation(reservation_id, hotel_id, customer_id, date_str=None):
         """
         Crea una nueva reserva y también reserva una habitación en el hotel.
         Verifica si existe el hotel y el cliente antes de crear.
+        La habitación y la reserva se guardan en una sola transacción: si
+        la reserva ya existe, la habitación no queda ocupada.
         """
-        hotels = HotelManager.load_hotels()
-        if hotel_id not in hotels:
+        if HotelManager.get_hotel(hotel_id) is None:
             print(f"No se encontró hotel con ID '{hotel_id}'.")
             return False
 
-        customers = CustomerManager.load_customers()
-        if customer_id not in customers:
+        if CustomerManager.get_customer(customer_id) is None:
             print(f"No se encontró cliente con ID '{customer_id}'.")
             return False
 
-        # Reservar habitación en el hotel
-        success = hotels[hotel_id].reserve_room()
-        if not success:
-            print("No hay disponibilidad en el hotel.")
-            return False
-        # Guardar la info del hotel actualizada
-        HotelManager.save_hotels(hotels)
-
-        # Crear la reserva si no existe ya
-        reservations = ReservationManager.load_reservations()
-        if reservation_id in reservations:
-            print(f"Reserva con ID '{reservation_id}' ya existe.")
-            return False
-
-        reservations[reservation_id] = Reservation(
+        reservation = Reservation(
             reservation_id, hotel_id, customer_id, date_str
         )
-        ReservationManager.save_reservations(reservations)
+        connection = get_connection()
+        try:
+            with connection:
+                # Reservar habitación en el hotel
+                cursor = connection.execute(
+                    "UPDATE hotels SET reserved_rooms = reserved_rooms + 1 "
+                    "WHERE hotel_id = ? AND reserved_rooms < total_rooms",
+                    (hotel_id,)
+                )
+                if cursor.rowcount == 0:
+                    print("No hay disponibilidad en el hotel.")
+                    return False
+
+                connection.execute(
+                    "INSERT INTO reservations (reservation_id, hotel_id, "
+                    "customer_id, date_str) VALUES (?, ?, ?, ?)",
+                    (reservation.reservation_id, reservation.hotel_id,
+                     reservation.customer_id, reservation.date_str)
+                )
+        except sqlite3.IntegrityError:
+            print(f"Reserva con ID '{reservation_id}' ya existe.")
+            return False
         return True
 
     @staticmethod
     def cancel_reservation(reservation_id):
         """
-        Cancela la reserva si existe.
+        Cancela la reserva si existe y libera su habitación en el hotel.
         """
-        reservations = ReservationManager.load_reservations()
-        if reservation_id not in reservations:
-            print(f"No se encontró reserva con ID '{reservation_id}'.")
-            return False
-
-        hotel_id = reservations[reservation_id].hotel_id
-        del reservations[reservation_id]
-        ReservationManager.save_reservations(reservations)
-
-        # Liberar la habitación en el hotel
-        hotels = HotelManager.load_hotels()
-        if hotel_id in hotels:
-            hotels[hotel_id].cancel_reservation()
-            HotelManager.save_hotels(hotels)
-
+        connection = get_connection()
+        with connection:
+            row = connection.execute(
+                "SELECT hotel_id FROM reservations WHERE reservation_id = ?",
+                (reservation_id,)
+            ).fetchone()
+            if row is None:
+                print(f"No se encontró reserva con ID '{reservation_id}'.")
+                return False
+
+            connection.execute(
+                "DELETE FROM reservations WHERE reservation_id = ?",
+                (reservation_id,)
+            )
+            # Liberar la habitación en el hotel
+            connection.execute(
+                "UPDATE hotels SET reserved_rooms = reserved_rooms - 1 "
+                "WHERE hotel_id = ? AND reserved_rooms > 0",
+                (row["hotel_id"],)
+            )
         return True
 
     @staticmethod
@@ -157,8 +146,8 @@ class ReservationManager:
         """
         Muestra la información de una reserva específica.
         """
-        reservations = ReservationManager.load_reservations()
-        if reservation_id not in reservations:
+        reservation = ReservationManager.get_reservation(reservation_id)
+        if reservation is None:
             print(f"No se encontró reserva con ID '{reservation_id}'.")
             return ""
-        return reservations[reservation_id].display_reservation_info()
+        return reservation.display_reservation_info()
@@ -0,0 +1,174 @@
+"""
+storage.py
+
+Almacenamiento SQLite compartido por HotelManager, CustomerManager y
+ReservationManager. Cada tabla tiene su ID como llave primaria, así que
+crear, buscar, modificar o borrar un registro cuesta O(log n) en lugar de
+reescribir un archivo JSON completo.
+
+La primera vez que se crea la base se importan los archivos de
+JSON_TABLES (TChotel.json, TCcustomer.json y TCreservation.json) si
+existen. También se puede migrar a mano, o volver a escribir esos
+archivos desde la base, con:
+
+    python storage.py
+    python storage.py --export
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+
+DB_PATH = "reservas.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS hotels (
+    hotel_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    location TEXT NOT NULL,
+    total_rooms INTEGER NOT NULL,
+    reserved_rooms INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS customers (
+    customer_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    email TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS reservations (
+    reservation_id TEXT PRIMARY KEY,
+    hotel_id TEXT NOT NULL,
+    customer_id TEXT NOT NULL,
+    date_str TEXT NOT NULL
+);
+"""
+
+# Archivo JSON, tabla y columnas (en el orden de la tabla, con el ID
+# primero) de cada entidad
+JSON_TABLES = (
+    ("TChotel.json", "hotels",
+     ("hotel_id", "name", "location", "total_rooms", "reserved_rooms")),
+    ("TCcustomer.json", "customers", ("customer_id", "name", "email")),
+    ("TCreservation.json", "reservations",
+     ("reservation_id", "hotel_id", "customer_id", "date_str")),
+)
+
+# Conexiones abiertas, una por ruta de base de datos
+_connections = {}
+
+
+def open_database(path):
+    """
+    Abre la base de datos en path y crea las tablas que falten.
+    """
+    connection = sqlite3.connect(path)
+    connection.row_factory = sqlite3.Row
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def get_connection():
+    """
+    Retorna la conexión a DB_PATH, abriéndola una sola vez.
+    Si la base no existía, crea las tablas e importa los archivos JSON.
+    """
+    connection = _connections.get(DB_PATH)
+    if connection is not None:
+        return connection
+
+    is_new = not os.path.exists(DB_PATH)
+    connection = open_database(DB_PATH)
+    if is_new:
+        migrate_json(connection)
+    _connections[DB_PATH] = connection
+    return connection
+
+
+def close_connections():
+    """
+    Cierra las conexiones abiertas (por ejemplo, al cambiar DB_PATH).
+    """
+    for connection in _connections.values():
+        connection.close()
+    _connections.clear()
+
+
+def migrate_json(connection):
+    """
+    Importa a sus tablas los archivos JSON_TABLES que existan.
+    Los IDs que ya están en la base se conservan.
+    Retorna {tabla: registros importados}.
+    """
+    counts = {}
+    for file_path, table, columns in JSON_TABLES:
+        if not os.path.exists(file_path):
+            continue
+        try:
+            with open(file_path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+            rows = [tuple(record[column] for column in columns)
+                    for record in data.values()]
+        except (json.JSONDecodeError, KeyError, TypeError,
+                AttributeError) as error:
+            print(f"[Error] Datos inválidos en {file_path}: {error}")
+            continue
+
+        placeholders = ", ".join("?" * len(columns))
+        with connection:
+            cursor = connection.executemany(
+                f"INSERT OR IGNORE INTO {table} ({', '.join(columns)}) "
+                f"VALUES ({placeholders})",
+                rows
+            )
+        counts[table] = max(cursor.rowcount, 0)
+    return counts
+
+
+def export_json(connection):
+    """
+    Escribe cada tabla en su archivo de JSON_TABLES, en el mismo formato
+    que migrate_json importa ({id: registro}).
+    Retorna {tabla: registros exportados}.
+    """
+    counts = {}
+    for file_path, table, columns in JSON_TABLES:
+        rows = connection.execute(
+            f"SELECT {', '.join(columns)} FROM {table} ORDER BY rowid"
+        ).fetchall()
+        data = {row[0]: dict(row) for row in rows}
+        with open(file_path, "w", encoding="utf-8") as file:
+            json.dump(data, file, indent=2)
+        counts[table] = len(rows)
+    return counts
+
+
+def main(argv=None):
+    """
+    Migra los archivos JSON a la base de datos, o con --export los
+    vuelve a escribir desde ella, y muestra cuántos registros se copiaron.
+    Exportar sin base de datos es un error: los archivos quedarían vacíos.
+    """
+    parser = argparse.ArgumentParser(prog="storage.py")
+    parser.add_argument("--export", action="store_true",
+                        help="escribir los archivos JSON desde la base")
+    args = parser.parse_args(argv)
+
+    if args.export:
+        if not os.path.exists(DB_PATH):
+            parser.error(f"no existe {DB_PATH}; no hay datos que exportar")
+        connection = open_database(DB_PATH)
+        counts = export_json(connection)
+        action = "exportados"
+    else:
+        connection = open_database(DB_PATH)
+        counts = migrate_json(connection)
+        action = "importados"
+    connection.close()
+    for table, count in counts.items():
+        print(f"{table}: {count} registros {action}.")
+    if not counts:
+        print("No se encontraron archivos JSON para migrar.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+test_storage.py
+
+Pruebas de la migración entre los archivos JSON y la base SQLite.
+Cada prueba trabaja en un directorio temporal con copias de los TC*.json.
+
+Uso: python -m unittest test_storage
+"""
+
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import storage
+from hotel import HotelManager
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+class StorageTest(unittest.TestCase):
+    """
+    Importación, exportación y protección de los archivos JSON.
+    """
+
+    def setUp(self):
+        self.previous_dir = os.getcwd()
+        self.work_dir = tempfile.mkdtemp()
+        for file_path, _, _ in storage.JSON_TABLES:
+            shutil.copy(os.path.join(HERE, file_path), self.work_dir)
+        os.chdir(self.work_dir)
+
+    def tearDown(self):
+        storage.close_connections()
+        os.chdir(self.previous_dir)
+        shutil.rmtree(self.work_dir)
+
+    @staticmethod
+    def read_json_files():
+        """
+        Retorna {archivo: contenido} de los archivos de JSON_TABLES.
+        """
+        data = {}
+        for file_path, _, _ in storage.JSON_TABLES:
+            with open(file_path, "r", encoding="utf-8") as file:
+                data[file_path] = json.load(file)
+        return data
+
+    def test_export_without_database_keeps_json(self):
+        """
+        Exportar sin reservas.db falla y no toca los archivos JSON.
+        """
+        before = self.read_json_files()
+        with contextlib.redirect_stderr(io.StringIO()):
+            with self.assertRaises(SystemExit):
+                storage.main(["--export"])
+        self.assertEqual(self.read_json_files(), before)
+        self.assertFalse(os.path.exists(storage.DB_PATH))
+
+        # La base se sigue creando a partir de los JSON
+        self.assertIsNotNone(HotelManager.get_hotel("H001"))
+
+    def test_export_round_trip(self):
+        """
+        Exportar lo que se migró reproduce los archivos originales.
+        """
+        before = self.read_json_files()
+        with contextlib.redirect_stdout(io.StringIO()):
+            storage.main([])
+            storage.main(["--export"])
+        self.assertEqual(self.read_json_files(), before)
+
+    def test_migration_keeps_existing_ids(self):
+        """
+        Migrar dos veces no duplica ni reemplaza registros.
+        """
+        connection = storage.open_database(storage.DB_PATH)
+        first = storage.migrate_json(connection)
+        second = storage.migrate_json(connection)
+        connection.close()
+        self.assertTrue(all(count > 0 for count in first.values()))
+        self.assertEqual(set(second.values()), {0})
+
+
+if __name__ == "__main__":
+    unittest.main()